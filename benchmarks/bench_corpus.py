@@ -0,0 +1,100 @@
+"""Memory and lookup-time benchmark for the synthetic web_search corpus.
+
+Generates corpora of 1k, 10k and 100k companies, serves web_search from
+each one, and reports on-disk size, memory held after opening the corpus,
+and per-query latency for targeted and sector-specific queries.
+
+Usage:
+    python benchmarks/bench_corpus.py
+    python benchmarks/bench_corpus.py --sizes 1000 10000 --queries 5000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from dspy_langgraph_crewai_comparison.common import tools
+from dspy_langgraph_crewai_comparison.common.corpus import generate_corpus
+
+
+def _rss_mb() -> float:
+    """Current resident set size (Linux); 0 where /proc is unavailable."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except OSError:
+        return 0.0
+    import resource
+
+    return pages * resource.getpagesize() / 1e6
+
+
+def bench(size: int, queries: int, workdir: Path, seed: int = 0) -> dict:
+    corpus_dir = workdir / f"corpus_{size}"
+    t0 = time.perf_counter()
+    generate_corpus(corpus_dir, size, seed=seed)
+    gen_s = time.perf_counter() - t0
+    disk_mb = sum(f.stat().st_size for f in corpus_dir.iterdir()) / 1e6
+
+    rss_before = _rss_mb()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    corpus = tools.use_corpus(corpus_dir)
+    open_ms = (time.perf_counter() - t0) * 1000
+    heap_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+
+    rng = random.Random(seed)
+    names = rng.sample(list(corpus.index), min(queries, len(corpus)))
+    latencies = []
+    for name in names:
+        record = corpus.get(name)
+        query = f"{name} {rng.choice(record['keywords_targeted'] + record['keywords_sector'])}"
+        t0 = time.perf_counter()
+        result = tools.web_search(query)
+        latencies.append((time.perf_counter() - t0) * 1e6)
+        assert not result.startswith("No results"), query
+    rss_after = _rss_mb()
+    tools.use_corpus(None)
+
+    latencies.sort()
+    return {
+        "companies": size,
+        "gen_s": gen_s,
+        "disk_mb": disk_mb,
+        "open_ms": open_ms,
+        "heap_mb": heap_mb,
+        "rss_delta_mb": rss_after - rss_before,
+        "p50_us": statistics.median(latencies),
+        "p99_us": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = [bench(size, args.queries, Path(tmp)) for size in args.sizes]
+
+    header = (
+        f"{'companies':>10} {'gen s':>7} {'disk MB':>8} {'open ms':>8} "
+        f"{'index MB':>9} {'RSS +MB':>8} {'p50 µs':>8} {'p99 µs':>8}"
+    )
+    print(header)
+    print("─" * len(header))
+    for r in rows:
+        print(
+            f"{r['companies']:>10} {r['gen_s']:>7.2f} {r['disk_mb']:>8.1f} "
+            f"{r['open_ms']:>8.1f} {r['heap_mb']:>9.1f} {r['rss_delta_mb']:>8.1f} "
+            f"{r['p50_us']:>8.1f} {r['p99_us']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Per-call latency of pooled MCP sessions vs a fresh connection per call.
+
+Runs the local stub MCP server (tests/mcp_stub_server.py) over stdio and calls
+its `search` tool:
+
+- fresh:  spawn the server, initialize a session, call, shut down — what a
+          tool pays if it connects on every ReAct step
+- pooled: MCPClientPool, sessions opened once and reused (sequential, and
+          from concurrent threads)
+
+Then crashes a pooled session's server to time the restart path.
+
+Usage (with src/ and tests/ on PYTHONPATH, as `just bench-mcp` sets):
+    python benchmarks/bench_mcp_pool.py
+    python benchmarks/bench_mcp_pool.py --calls 500 --threads 8 --pool-size 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp_stub_server import stub_config
+
+from dspy_langgraph_crewai_comparison.common.mcp_client import (
+    MCPClientPool,
+    MCPServerConfig,
+)
+
+QUERIES = ["Apple", "Tesla quarterly earnings", "Nvidia"]
+
+
+async def fresh_call(config: MCPServerConfig, query: str) -> str:
+    params = StdioServerParameters(
+        command=config.command, args=config.args, env=config.env
+    )
+    async with (
+        stdio_client(params) as (read, write),
+        ClientSession(read, write) as session,
+    ):
+        await session.initialize()
+        result = await session.call_tool(config.tool, {"query": query})
+        return result.content[0].text
+
+
+def timed(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - t0) * 1000
+
+
+def summarize(name: str, latencies_ms: list[float], wall_s: float | None = None):
+    latencies_ms = sorted(latencies_ms)
+    p95 = latencies_ms[max(int(len(latencies_ms) * 0.95) - 1, 0)]
+    wall = f"{wall_s:>9.2f}" if wall_s is not None else f"{'':>9}"
+    print(
+        f"{name:<22} {len(latencies_ms):>6} {statistics.median(latencies_ms):>9.2f} "
+        f"{p95:>9.2f} {wall}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200, help="Pooled calls")
+    parser.add_argument("--fresh-calls", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    config = stub_config("search", args.pool_size)
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.calls)]
+
+    header = f"{'mode':<22} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'wall s':>9}"
+    print(header)
+    print("─" * len(header))
+
+    fresh = [
+        timed(lambda q: asyncio.run(fresh_call(config, q)), queries[i])
+        for i in range(args.fresh_calls)
+    ]
+    summarize("fresh connection", fresh)
+
+    pool = MCPClientPool([config])
+    try:
+        warm_up_ms = timed(pool.warm_up)
+        sequential = [timed(pool.call_tool, "search", {"query": q}) for q in queries]
+        summarize("pooled, sequential", sequential)
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            concurrent = list(
+                executor.map(
+                    lambda q: timed(pool.call_tool, "search", {"query": q}), queries
+                )
+            )
+        summarize(
+            f"pooled, {args.threads} threads", concurrent, time.perf_counter() - t0
+        )
+
+        print(f"\nPool warm-up ({args.pool_size} sessions): {warm_up_ms:.0f} ms")
+        print(
+            f"Speed-up at p50: "
+            f"{statistics.median(fresh) / statistics.median(sequential):.0f}x"
+        )
+
+        # Crash one session's server: the call fails over to a fresh session,
+        # which crashes too (same tool), so the error is expected. The next
+        # call on that session is served after a restart.
+        try:
+            pool.call_tool("search", {}, tool="crash")
+        except Exception:
+            pass
+        recovery_ms = [
+            timed(pool.call_tool, "search", {"query": "Apple"})
+            for _ in range(args.pool_size)
+        ]
+        print(f"Slowest call after a server crash: {max(recovery_ms):.0f} ms")
+        print(f"Pool stats: {pool.stats()['search']}")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
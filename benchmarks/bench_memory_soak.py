@@ -0,0 +1,111 @@
+"""Memory soak benchmark: RSS over many stub pipeline runs.
+
+Runs the full CompanyResearchPipeline (ReAct researcher with a real tool
+call, writer, reviewer, workspace dumps) against a scripted DummyLM, and
+samples RSS at checkpoints. In bounded mode (configure_memory) RSS should
+stay flat; with --unbounded it grows with dspy's LM history and trace.
+
+Usage:
+    python benchmarks/bench_memory_soak.py                 # 10k bounded runs
+    python benchmarks/bench_memory_soak.py --runs 2000 --unbounded
+"""
+
+import argparse
+import itertools
+import sys
+import tempfile
+import time
+
+import dspy
+from dspy.utils import DummyLM
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.common.memory import rss_mb
+from dspy_langgraph_crewai_comparison.common.workspace import Workspace
+from dspy_langgraph_crewai_comparison.dspy_impl.pipeline import (
+    CompanyResearchPipeline,
+)
+from dspy_langgraph_crewai_comparison.dspy_impl.run import configure_memory
+
+FACTS = {
+    "company_name": "Apple Inc.",
+    "sector": "Technology",
+    "recent_news": ["a (Jan 1, 2026)", "b (Jan 2, 2026)", "c (Jan 3, 2026)"],
+    "financial_highlights": ["Revenue $124.3B", "Margin 46.9%"],
+    "key_events": ["Buyback"],
+    "sources": ["https://investor.apple.com/quarterly-results/2026-q1"],
+}
+SUMMARY = {
+    "summary_text": "Apple beat estimates.",
+    "key_risks": ["Regulation"],
+    "outlook": "Bullish.",
+    "confidence_score": 0.8,
+}
+REVIEW = {
+    "claim_verifications": [],
+    "accuracy_ratio": 1.0,
+    "expected_facets": ["news"],
+    "covered_facets": ["news"],
+    "completeness_ratio": 1.0,
+    "conciseness_rating": 5,
+    "feedback": "Good.",
+    "issues": [],
+    "approved": True,
+}
+
+# One pipeline run: search, finish, extract facts, write, review.
+RUN_SCRIPT = [
+    {
+        "next_thought": "Search first.",
+        "next_tool_name": "search",
+        "next_tool_args": {"query": "Apple quarterly earnings"},
+    },
+    {"next_thought": "Done.", "next_tool_name": "finish", "next_tool_args": {}},
+    {"reasoning": "Extracted.", "company_facts": FACTS},
+    {"reasoning": "Summarized.", "analyst_summary": SUMMARY},
+    {"reasoning": "Reviewed.", "review": REVIEW},
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10_000)
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--history-size", type=int, default=100)
+    parser.add_argument("--unbounded", action="store_true")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    lm = DummyLM([])
+    lm.answers = itertools.cycle(RUN_SCRIPT)
+    dspy.configure(lm=lm)
+    memory = None if args.unbounded else configure_memory(args.history_size)
+    pipeline = CompanyResearchPipeline(memory=memory)
+
+    every = max(args.runs // args.checkpoints, 1)
+    samples = []
+    t0 = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(1, args.runs + 1):
+            pipeline.ws = Workspace(tmp, run_id=f"run_{i:06d}")
+            pipeline(company_name="Apple")
+            if i == 1 or i % every == 0:
+                samples.append((i, rss_mb(), time.perf_counter() - t0))
+
+    mode = "unbounded" if args.unbounded else f"bounded (history={args.history_size})"
+    print(f"Memory soak: {args.runs} stub runs, {mode}")
+    print(f"{'runs':>8} {'RSS MB':>8} {'Δ MB':>8} {'elapsed s':>10}")
+    print("─" * 37)
+    for runs, rss, elapsed in samples:
+        print(f"{runs:>8} {rss:>8.1f} {rss - samples[0][1]:>8.1f} {elapsed:>10.1f}")
+    if len(samples) > 2:
+        # Growth over the second half, after caches and allocator pools warm up
+        mid = samples[len(samples) // 2]
+        per_1k = (samples[-1][1] - mid[1]) / (samples[-1][0] - mid[0]) * 1000
+        print(f"Steady-state growth: {per_1k:+.2f} MB per 1k runs")
+
+
+if __name__ == "__main__":
+    main()
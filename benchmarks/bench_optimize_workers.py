@@ -0,0 +1,109 @@
+"""Evaluation wall time vs worker count for the GEPA optimization loop.
+
+Scores the full CompanyResearchPipeline on N companies with a scripted
+DummyLM that sleeps on every call (simulated provider latency), at each
+worker count, through:
+
+- ParallelEvaluator — optimize.py's baseline/final evaluations
+- dspy.Evaluate     — dspy's parallelizer, which GEPA uses to score
+                      candidates (dspy.GEPA(num_threads=...))
+
+Each run gets its own scripted LM, so concurrent runs don't interleave
+answers. No result cache: every run is executed.
+
+Usage:
+    python benchmarks/bench_optimize_workers.py
+    python benchmarks/bench_optimize_workers.py --companies 32 --latency 0.1
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+import dspy
+from bench_memory_soak import RUN_SCRIPT
+from dspy.utils import DummyLM
+from dspy.utils.callback import BaseCallback
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.dspy_impl.optimize import (
+    ParallelEvaluator,
+    research_metric,
+)
+from dspy_langgraph_crewai_comparison.dspy_impl.pipeline import (
+    CompanyResearchPipeline,
+)
+
+
+class LatencyCallback(BaseCallback):
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def on_lm_start(self, call_id, instance, inputs):
+        time.sleep(self.seconds)
+
+
+class ScriptedRun(dspy.Module):
+    """The pipeline, answered by a fresh scripted LM per run."""
+
+    def __init__(self):
+        self.pipeline = CompanyResearchPipeline()
+
+    def forward(self, company_name: str):
+        with dspy.context(lm=DummyLM(RUN_SCRIPT)):
+            return self.pipeline(company_name=company_name)
+
+
+def _metric(gold, pred, trace=None):
+    return research_metric(gold, pred).score
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05, help="s per LM call")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    logging.getLogger("dspy").setLevel(logging.WARNING)
+    dspy.configure(callbacks=[LatencyCallback(args.latency)])
+
+    program = ScriptedRun()
+    devset = [
+        dspy.Example(company_name=f"Company {i}").with_inputs("company_name")
+        for i in range(args.companies)
+    ]
+
+    print(
+        f"{args.companies} runs × {len(RUN_SCRIPT)} LM calls, "
+        f"{args.latency * 1000:.0f} ms per call"
+    )
+    print(f"{'workers':>8} {'evaluator s':>12} {'dspy.Evaluate s':>16} {'speed-up':>9}")
+    print("─" * 48)
+    serial = None
+    for workers in args.workers:
+        t0 = time.perf_counter()
+        ParallelEvaluator(num_threads=workers)(program, devset)
+        evaluator_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        dspy.Evaluate(
+            devset=devset,
+            metric=_metric,
+            num_threads=workers,
+            display_progress=False,
+        )(program)
+        evaluate_s = time.perf_counter() - t0
+
+        serial = serial or evaluator_s
+        print(
+            f"{workers:>8} {evaluator_s:>12.2f} {evaluate_s:>16.2f} "
+            f"{serial / evaluator_s:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Synthetic company corpus for load-testing web_search and the pipeline.
+
+Generates N companies shaped like the entries in ``tools.MOCK_DATA`` (news,
+financials, events, good and bad sources, bonus insights, tiered search
+keywords). Sectors and subsectors come from the skill's sector-taxonomy.json
+and sector keywords from references/search-strategies.md, so tier
+detection in web_search behaves the same way as for the handwritten data.
+
+On-disk format (one directory):
+- ``records.bin`` — zlib-compressed JSON records, concatenated
+- ``index.json``  — {"<lowercase name>": [offset, length], ...}
+
+The records file is memory-mapped and a record is only decompressed when
+it is looked up, so resident memory is dominated by the index.
+
+Usage:
+    python -m dspy_langgraph_crewai_comparison.common.corpus ./corpus -n 10000
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import re
+import zlib
+from pathlib import Path
+
+from loguru import logger
+
+SKILL_DIR = Path(__file__).parent / "skills" / "company-researcher"
+
+TARGETED_KEYWORDS = ["earnings", "quarterly", "revenue", "financial"]
+
+_NAME_PREFIXES = """
+    Arc Bright Cobalt Delta Ever Falcon Granite Helio Iron Juniper Kestrel
+    Lumen Meridian Nova Onyx Pioneer Quartz Redwood Summit Terra Ultra Vertex
+    Willow Zenith
+""".split()
+_NAME_SUFFIXES = """
+    bridge core dyne field gate line mark point scale stone tech ton vale ware
+    wave works
+""".split()
+_NAME_TYPES = """
+    Systems Holdings Industries Labs Group Dynamics Networks Therapeutics
+    Energy Capital Motors Retail
+""".split()
+_MONTHS = ["Jan", "Feb", "Mar"]
+_OUTLETS = [
+    "reuters.com/business",
+    "bloomberg.com/news",
+    "ft.com/content",
+    "wsj.com/articles",
+]
+_BAD_SOURCE_TEMPLATES = [
+    "not-a-valid-url",
+    "htp://{slug}-news.com/broken-link",
+    "www.cnbc.com/{slug}-update",
+    "https//{slug}.com/investors",
+]
+
+_NEWS_TEMPLATES = [
+    "{name} reports Q{q} FY2026 revenue of ${rev}B, {beat} estimates by {pct}%",
+    "{name} expands {subsector} business into {region} markets",
+    "{name} announces ${deal}M acquisition to strengthen {subsector} portfolio",
+    "{name} names new Chief Financial Officer amid {subsector} push",
+    "{name} shares move {move}% after {subsector} guidance update",
+    "Regulators open review of {name}'s {subsector} operations",
+]
+_FINANCIAL_TEMPLATES = [
+    "Q{q} FY2026 revenue: ${rev}B ({sign}{yoy}% YoY)",
+    "Gross margin: {margin}%, {dir} from {prev_margin}% year-ago quarter",
+    "{subsector} revenue: ${seg}B ({sign}{seg_yoy}% YoY)",
+    "Free cash flow: ${fcf}B",
+    "Operating expenses: ${opex}B, R&D at {rnd}% of revenue",
+]
+_EVENT_TEMPLATES = [
+    "Opened new {subsector} facility in {city}",
+    "Announced ${buyback}B share buyback program",
+    "Launched next-generation {subsector} product line",
+    "Signed multi-year partnership with a major {region} customer",
+    "Completed restructuring of {subsector} division",
+]
+_BONUS_TEMPLATES = [
+    "R&D spending: ${rnd_abs}B in Q{q} FY2026, up {rnd_yoy}% YoY",
+    "Customer base grew to {customers}M accounts, up {cust_yoy}% YoY",
+    "Backlog reached ${backlog}B, a company record",
+]
+_REGIONS = ["EU", "Asia-Pacific", "Latin American", "Middle East", "North American"]
+_CITIES = ["Munich", "Austin", "Singapore", "Toronto", "Dublin", "Bangalore", "Osaka"]
+
+
+def load_sector_taxonomy(skill_dir: Path = SKILL_DIR) -> list[dict]:
+    path = skill_dir / "assets" / "sector-taxonomy.json"
+    return json.loads(path.read_text(encoding="utf-8"))["sectors"]
+
+
+def load_search_keywords(skill_dir: Path = SKILL_DIR) -> dict[str, list[str]]:
+    """Parse search-strategies.md into {section heading: [query keywords]}.
+
+    'Search: "{company} data center revenue"' becomes "data center revenue";
+    {year}/{month} placeholders are dropped."""
+    path = skill_dir / "references" / "search-strategies.md"
+    keywords: dict[str, list[str]] = {}
+    section = None
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.startswith("## "):
+            section = line[3:].split("(")[0].strip()
+            keywords[section] = []
+        elif section and (match := re.search(r'Search: "(.+)"', line)):
+            phrase = re.sub(r"\{\w+\}", "", match.group(1))
+            keywords[section].append(" ".join(phrase.split()))
+    return keywords
+
+
+def _strategy_for(sector: str, strategies: dict[str, list[str]]) -> list[str]:
+    """Match a taxonomy sector to its search-strategies section."""
+    if sector in strategies:
+        return strategies[sector]
+    for part in reversed([p.strip() for p in sector.split("/")]):
+        if part in strategies:
+            return strategies[part]
+    return strategies.get("General", [])
+
+
+def _company_name(rng: random.Random, taken: dict) -> str:
+    """Draw a unique name: "Arcbridge Systems", then "Arcbridge Nova Systems"
+    once the two-word space gets crowded, then a numeric suffix."""
+    stem = f"{rng.choice(_NAME_PREFIXES)}{rng.choice(_NAME_SUFFIXES)}"
+    kind = rng.choice(_NAME_TYPES)
+    for name in (f"{stem} {kind}", f"{stem} {rng.choice(_NAME_PREFIXES)} {kind}"):
+        if name.lower() not in taken:
+            return name
+    return f"{stem} {kind} {len(taken)}"
+
+
+def _fill(template: str, rng: random.Random, **ctx) -> str:
+    margin = round(rng.uniform(15, 75), 1)
+    prev_margin = round(margin + rng.uniform(-5, 5), 1)
+    values = {
+        "q": rng.randint(1, 4),
+        "rev": round(rng.uniform(0.5, 120), 1),
+        "beat": rng.choice(["beating", "missing"]),
+        "pct": rng.randint(1, 9),
+        "region": rng.choice(_REGIONS),
+        "city": rng.choice(_CITIES),
+        "deal": rng.randint(50, 2000),
+        "move": rng.randint(2, 15),
+        "sign": rng.choice(["+", "-"]),
+        "yoy": rng.randint(1, 40),
+        "margin": margin,
+        "prev_margin": prev_margin,
+        "dir": "up" if margin >= prev_margin else "down",
+        "seg": round(rng.uniform(0.1, 40), 1),
+        "seg_yoy": rng.randint(1, 90),
+        "fcf": round(rng.uniform(0.1, 20), 1),
+        "opex": round(rng.uniform(0.2, 30), 1),
+        "rnd": rng.randint(3, 25),
+        "buyback": rng.randint(1, 50),
+        "rnd_abs": round(rng.uniform(0.1, 9), 1),
+        "rnd_yoy": rng.randint(1, 30),
+        "customers": rng.randint(1, 500),
+        "cust_yoy": rng.randint(1, 40),
+        "backlog": round(rng.uniform(1, 200), 1),
+    }
+    return template.format(**values, **ctx)
+
+
+def generate_company(
+    rng: random.Random,
+    name: str,
+    taxonomy: list[dict],
+    strategies: dict[str, list[str]],
+) -> dict:
+    """Generate one company record in the MOCK_DATA shape."""
+    sector = rng.choice(taxonomy)
+    subsector = rng.choice(sector["subsectors"])
+    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+    ctx = {"name": name, "subsector": subsector, "slug": slug}
+
+    # Generic phrases such as "quarterly earnings" would make a targeted
+    # query look sector-specific (sector keywords are checked first).
+    sector_keywords = [
+        kw
+        for kw in _strategy_for(sector["name"], strategies)
+        if not any(targeted in kw.lower() for targeted in TARGETED_KEYWORDS)
+    ]
+
+    news = [
+        f"{_fill(t, rng, **ctx)} ({rng.choice(_MONTHS)} {rng.randint(1, 28)}, 2026)"
+        for t in rng.sample(_NEWS_TEMPLATES, rng.randint(3, 5))
+    ]
+    return {
+        "name": name,
+        "news": news,
+        "financials": [
+            _fill(t, rng, **ctx) for t in rng.sample(_FINANCIAL_TEMPLATES, 4)
+        ],
+        "events": [
+            _fill(t, rng, **ctx)
+            for t in rng.sample(_EVENT_TEMPLATES, rng.randint(1, 3))
+        ],
+        "sources_good": [f"https://investor.{slug}.com/quarterly-results/2026"]
+        + [
+            f"https://www.{outlet}/{slug}-{rng.randint(1000, 9999)}"
+            for outlet in rng.sample(_OUTLETS, 2)
+        ],
+        "sources_bad": [rng.choice(_BAD_SOURCE_TEMPLATES).format(slug=slug)],
+        "bonus": [_fill(t, rng, **ctx) for t in rng.sample(_BONUS_TEMPLATES, 2)],
+        "sector": sector["name"],
+        "keywords_targeted": TARGETED_KEYWORDS,
+        "keywords_sector": sector_keywords + [subsector],
+    }
+
+
+def generate_corpus(out_dir: str | Path, n: int, seed: int = 0) -> Path:
+    """Generate n companies and write them to out_dir. Returns out_dir."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    taxonomy = load_sector_taxonomy()
+    strategies = load_search_keywords()
+
+    index: dict[str, list[int]] = {}
+    offset = 0
+    with open(out_dir / "records.bin", "wb") as f:
+        for _ in range(n):
+            name = _company_name(rng, index)
+            record = generate_company(rng, name, taxonomy, strategies)
+            blob = zlib.compress(json.dumps(record, separators=(",", ":")).encode())
+            f.write(blob)
+            index[name.lower()] = [offset, len(blob)]
+            offset += len(blob)
+
+    with open(out_dir / "index.json", "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    logger.info(f"Generated {n} companies ({offset / 1e6:.1f} MB) in {out_dir}")
+    return out_dir
+
+
+_POSSESSIVE = re.compile(r"['’]s\b")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+class SyntheticCorpus:
+    """Read-only, memory-mapped view over a generated corpus."""
+
+    def __init__(self, corpus_dir: str | Path):
+        self.corpus_dir = Path(corpus_dir)
+        with open(self.corpus_dir / "index.json", encoding="utf-8") as f:
+            self.index: dict[str, list[int]] = json.load(f)
+        self.max_name_words = max((len(name.split()) for name in self.index), default=0)
+        self._file = open(self.corpus_dir / "records.bin", "rb")
+        self._mmap: mmap.mmap | None = None
+        try:
+            # An empty file can't be mapped; it just means an empty corpus.
+            if os.fstat(self._file.fileno()).st_size:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.index
+
+    def get(self, name: str) -> dict | None:
+        entry = self.index.get(name.lower())
+        if entry is None or self._mmap is None:
+            return None
+        offset, length = entry
+        return json.loads(zlib.decompress(self._mmap[offset : offset + length]))
+
+    def find(self, query_lower: str) -> tuple[str, dict] | None:
+        """Find the company named in a query by probing word n-grams,
+        longest first, against the index (no scan over all companies).
+
+        Possessives and punctuation are dropped first, so "Arcdyne
+        Capital's earnings" finds "arcdyne capital"."""
+        words = _NON_WORD.sub(" ", _POSSESSIVE.sub("", query_lower)).split()
+        for size in range(min(self.max_name_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                name = " ".join(words[start : start + size])
+                if name in self.index:
+                    return name, self.get(name)
+        return None
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic corpus.")
+    parser.add_argument("out_dir")
+    parser.add_argument("-n", type=int, default=1000, help="Number of companies")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    generate_corpus(args.out_dir, args.n, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
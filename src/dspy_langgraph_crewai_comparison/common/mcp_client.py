@@ -0,0 +1,425 @@
+"""Pooled MCP client sessions for agent tools.
+
+Opening an MCP session over stdio spawns the server and runs the
+initialize handshake, which costs far more than the tool call itself. So
+each configured server gets a pool of long-lived sessions:
+
+- sessions are opened lazily, up to `pool_size` per server, and reused
+  across tool calls and pipeline runs
+- concurrent callers each get their own session; with all of them busy,
+  callers wait for one to be released
+- a session idle for longer than `health_interval` is pinged before it is
+  handed out; a failed ping or a dead transport/server process restarts it
+  (a call that hit the dead transport is retried once on the fresh session).
+  Tool errors and call timeouts leave the session in place
+- each call_tool() is bounded by connect_timeout + call_timeout
+
+The MCP client is asyncio-based; MCPClientPool runs it on a background
+event loop and exposes a blocking call_tool(), so the ReAct tools (plain
+functions, called from worker threads) can use it directly.
+
+Stateful servers (e.g. a Python REPL) keep state per session. Inside
+run_session(server), calls to that server go to one session of its own,
+which is discarded when the block exits, so a run sees its own earlier
+calls and nothing from other runs.
+
+Requires the optional `mcp` package.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import shlex
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.common.tracing import span
+
+# JSON-RPC error code the MCP SDK uses when the connection drops
+CONNECTION_CLOSED = -32000
+# How often a caller waiting for a busy session re-checks for free capacity
+RECHECK_INTERVAL = 1.0
+
+
+@dataclass
+class MCPServerConfig:
+    """A stdio MCP server and the tool the agent calls on it."""
+
+    name: str
+    command: str
+    tool: str
+    args: list[str] = field(default_factory=list)
+    env: dict[str, str] | None = None
+    pool_size: int = 2
+
+    @classmethod
+    def from_command_line(cls, name: str, command_line: str, tool: str, **kwargs):
+        command, *args = shlex.split(command_line)
+        return cls(name=name, command=command, tool=tool, args=args, **kwargs)
+
+
+class _Session:
+    """One live session; the task holding its transport stays open until
+    `closed` is set (anyio scopes must exit in the task that entered them)."""
+
+    def __init__(self, session, task: asyncio.Task, closed: asyncio.Event):
+        self.session = session
+        self.task = task
+        self.closed = closed
+        self.last_used = time.monotonic()
+        self.calls = 0
+
+    @property
+    def alive(self) -> bool:
+        return not self.task.done()
+
+    async def close(self):
+        self.closed.set()
+        try:
+            await asyncio.wait_for(self.task, timeout=5)
+        except Exception:
+            self.task.cancel()
+
+
+@dataclass
+class _Lease:
+    """A session checked out for a whole run_session() block; taken on the
+    block's first call to the server."""
+
+    pooled: _Session | None = None
+
+
+def _transport_failed(pooled: _Session, error: Exception) -> bool:
+    """Whether `error` means the session's transport or server process is
+    gone (restart), rather than a tool-level error or a timeout."""
+    import anyio
+
+    if not pooled.alive:
+        return True
+    if isinstance(error, asyncio.TimeoutError):  # an OSError on 3.11+
+        return False
+    if isinstance(
+        error,
+        (
+            OSError,
+            anyio.ClosedResourceError,
+            anyio.BrokenResourceError,
+            anyio.EndOfStream,
+        ),
+    ):
+        return True
+    # McpError (1.x) / MCPError (2.x)
+    code = getattr(getattr(error, "error", None), "code", None)
+    return code == CONNECTION_CLOSED
+
+
+class _ServerPool:
+    """Session pool for one server; used only from the event loop thread."""
+
+    def __init__(
+        self,
+        config: MCPServerConfig,
+        health_interval: float,
+        connect_timeout: float,
+    ):
+        self.config = config
+        self.health_interval = health_interval
+        self.connect_timeout = connect_timeout
+        self._idle: asyncio.Queue[_Session] = asyncio.Queue()
+        self._sessions: list[_Session] = []
+        self._opening = 0
+        self.opened = 0
+        self.restarts = 0
+        self.calls = 0
+
+    async def _open(self) -> _Session:
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+
+        params = StdioServerParameters(
+            command=self.config.command, args=self.config.args, env=self.config.env
+        )
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        closed = asyncio.Event()
+
+        async def hold():
+            try:
+                async with (
+                    stdio_client(params) as (read, write),
+                    ClientSession(read, write) as session,
+                ):
+                    await session.initialize()
+                    ready.set_result(session)
+                    await closed.wait()
+            except BaseException as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                elif not closed.is_set():
+                    logger.warning(f"MCP session to {self.config.name} died: {e!r}")
+
+        task = asyncio.create_task(hold())
+        try:
+            session = await asyncio.wait_for(ready, self.connect_timeout)
+        except BaseException:
+            closed.set()
+            task.cancel()
+            raise
+        self.opened += 1
+        pooled = _Session(session, task, closed)
+        self._sessions.append(pooled)
+        return pooled
+
+    async def _healthy(self, pooled: _Session) -> bool:
+        if not pooled.alive:
+            return False
+        if time.monotonic() - pooled.last_used < self.health_interval:
+            return True
+        try:
+            await asyncio.wait_for(pooled.session.send_ping(), timeout=5)
+            return True
+        except Exception:
+            return False
+
+    async def _restart(self, pooled: _Session, reason: str) -> _Session:
+        logger.warning(f"🔌 Restarting MCP session to {self.config.name}: {reason}")
+        self.restarts += 1
+        # If reopening fails the session is simply gone; acquire() opens a
+        # replacement on demand.
+        if pooled in self._sessions:
+            self._sessions.remove(pooled)
+        await pooled.close()
+        return await self._open()
+
+    async def acquire(self) -> _Session:
+        while True:
+            if self._idle.empty() and len(self._sessions) + self._opening < (
+                self.config.pool_size
+            ):
+                self._opening += 1
+                try:
+                    return await self._open()
+                finally:
+                    self._opening -= 1
+            # Wait in slices: a failed restart shrinks the pool without
+            # releasing anything, so re-check for room to open a session.
+            try:
+                pooled = await asyncio.wait_for(self._idle.get(), RECHECK_INTERVAL)
+                break
+            except asyncio.TimeoutError:
+                continue
+        if not await self._healthy(pooled):
+            pooled = await self._restart(pooled, "health check failed")
+        return pooled
+
+    async def fill(self):
+        """Open sessions up to pool_size, counting those already open or
+        being opened."""
+        missing = self.config.pool_size - len(self._sessions) - self._opening
+        if missing <= 0:
+            return
+        self._opening += missing
+        try:
+            opened = await asyncio.gather(
+                *(self._open() for _ in range(missing)), return_exceptions=True
+            )
+        finally:
+            self._opening -= missing
+        for pooled in opened:
+            if isinstance(pooled, _Session):
+                self.release(pooled)
+        for error in opened:
+            if isinstance(error, BaseException):
+                raise error
+
+    async def discard(self, pooled: _Session):
+        """Close a session instead of returning it to the pool."""
+        if pooled in self._sessions:
+            self._sessions.remove(pooled)
+        await pooled.close()
+
+    def release(self, pooled: _Session, suspect: bool = False):
+        # A suspect session is pinged before its next use.
+        pooled.last_used = 0.0 if suspect else time.monotonic()
+        self._idle.put_nowait(pooled)
+
+    async def call(
+        self, tool: str, arguments: dict, timeout: float, lease: _Lease | None = None
+    ):
+        """Call `tool` on a pooled session, or on the lease's own session
+        (which stays checked out)."""
+        if lease is None:
+            pooled = await self.acquire()
+        else:
+            if lease.pooled is None:
+                lease.pooled = await self.acquire()
+            pooled = lease.pooled
+        try:
+            for attempt in (1, 2):
+                try:
+                    result = await asyncio.wait_for(
+                        pooled.session.call_tool(tool, arguments), timeout
+                    )
+                except Exception as e:
+                    if attempt == 2 or not _transport_failed(pooled, e):
+                        raise
+                    if lease is not None:
+                        lease.pooled = None
+                    pooled = await self._restart(pooled, f"transport failed: {e!r}")
+                    if lease is not None:
+                        lease.pooled = pooled
+                    continue
+                pooled.calls += 1
+                self.calls += 1
+                if lease is None:
+                    self.release(pooled)
+                return result
+        except BaseException:
+            # Timed out, cancelled or failed: hand the session back to be
+            # pinged before reuse (unless a failed restart already dropped it).
+            if lease is None and pooled in self._sessions:
+                self.release(pooled, suspect=True)
+            raise
+
+    async def close(self):
+        for pooled in self._sessions:
+            await pooled.close()
+        self._sessions.clear()
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "opened": self.opened,
+            "restarts": self.restarts,
+            "calls": self.calls,
+        }
+
+
+def _result_text(result) -> str:
+    text = "\n".join(
+        item.text for item in result.content if getattr(item, "text", None)
+    )
+    # `is_error` in mcp 2.x, `isError` in 1.x
+    if getattr(result, "is_error", None) or getattr(result, "isError", False):
+        return f"Tool error: {text}"
+    return text
+
+
+class MCPClientPool:
+    """Blocking facade over per-server session pools.
+
+    Shared by every pipeline in the process (program copies included)."""
+
+    def __init__(
+        self,
+        servers: list[MCPServerConfig],
+        health_interval: float = 30.0,
+        connect_timeout: float = 30.0,
+        call_timeout: float = 60.0,
+    ):
+        try:
+            import mcp  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "MCP servers are configured but the `mcp` package is not "
+                "installed (uv add mcp)"
+            ) from e
+
+        self.servers = {server.name: server for server in servers}
+        self.health_interval = health_interval
+        self.connect_timeout = connect_timeout
+        self.call_timeout = call_timeout
+        self._pools: dict[str, _ServerPool] = {}
+        self._leases: contextvars.ContextVar[dict[str, _Lease] | None] = (
+            contextvars.ContextVar(f"mcp_leases_{id(self)}", default=None)
+        )
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="mcp-client", daemon=True
+        )
+        self._thread.start()
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _run(self, coro, timeout: float | None = None):
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()  # stop it on the loop too
+            raise
+
+    def _pool(self, server: str) -> _ServerPool:
+        # Only touched from the loop thread, so no lock is needed.
+        if server not in self._pools:
+            self._pools[server] = _ServerPool(
+                self.servers[server], self.health_interval, self.connect_timeout
+            )
+        return self._pools[server]
+
+    def has(self, server: str) -> bool:
+        return server in self.servers
+
+    def call_tool(self, server: str, arguments: dict, tool: str | None = None) -> str:
+        """Call `tool` (default: the server's configured tool); returns its
+        text content."""
+        tool = tool or self.servers[server].tool
+        lease = (self._leases.get() or {}).get(server)
+
+        async def call():
+            return await self._pool(server).call(
+                tool, arguments, self.call_timeout, lease
+            )
+
+        timeout = self.connect_timeout + self.call_timeout
+        with span("mcp.call", cat="mcp", server=server, tool=tool):
+            return _result_text(self._run(call(), timeout))
+
+    @contextmanager
+    def run_session(self, server: str):
+        """Send the block's calls to `server` to one session of its own
+        (also from worker threads that copy the context), and discard that
+        session when the block exits: state kept by a stateful server, such
+        as a REPL's variables, doesn't leak into other runs."""
+        leases = dict(self._leases.get() or {})
+        lease = leases[server] = _Lease()
+        token = self._leases.set(leases)
+        try:
+            yield
+        finally:
+            self._leases.reset(token)
+            if lease.pooled is not None:
+
+                async def discard():
+                    await self._pool(server).discard(lease.pooled)
+
+                self._run(discard(), timeout=10)
+
+    def warm_up(self):
+        """Open every server's full pool now instead of on first use."""
+
+        async def fill_all():
+            await asyncio.gather(*(self._pool(name).fill() for name in self.servers))
+
+        self._run(fill_all())
+
+    def stats(self) -> dict:
+        async def collect():
+            return {name: pool.stats() for name, pool in self._pools.items()}
+
+        return self._run(collect())
+
+    def close(self):
+        async def close_all():
+            for pool in self._pools.values():
+                await pool.close()
+
+        try:
+            self._run(close_all(), timeout=30)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
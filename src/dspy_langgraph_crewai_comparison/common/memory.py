@@ -0,0 +1,94 @@
+"""Memory guard for long-running batch and server processes.
+
+- release(): hooks run after every persisted run (e.g. trimming LM history)
+- stage(): optional tracemalloc diff per pipeline stage, top allocators kept
+- check(): RSS ceiling; on breach, collect, log the top allocators per stage
+  and raise MemoryError so the caller can stop or recycle the process
+
+tracemalloc is process-wide: with concurrent runs, a stage's diff also
+includes allocations made by other runs at the same time.
+"""
+
+import gc
+import resource
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * resource.getpagesize() / 1e6
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+class MemoryGuard:
+    def __init__(
+        self,
+        rss_limit_mb: float | None = None,
+        trace_allocations: bool = False,
+        top_n: int = 10,
+    ):
+        self.rss_limit_mb = rss_limit_mb
+        self.trace_allocations = trace_allocations
+        self.top_n = top_n
+        self.release_hooks: list[Callable[[], None]] = []
+        self.stage_reports: dict[str, list[str]] = {}
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add_release_hook(self, hook: Callable[[], None]):
+        self.release_hooks.append(hook)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Record the top allocation growth of a stage (if tracing)."""
+        if not self.trace_allocations:
+            yield
+            return
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            stats = after.compare_to(before, "lineno")[: self.top_n]
+            self.stage_reports[name] = [str(stat) for stat in stats]
+
+    def release(self):
+        for hook in self.release_hooks:
+            hook()
+
+    def report(self) -> dict:
+        return {"rss_mb": round(rss_mb(), 1), "stages": self.stage_reports}
+
+    def check(self) -> float:
+        """Enforce the RSS ceiling; returns the current RSS in MB."""
+        current = rss_mb()
+        if self.rss_limit_mb is None or current <= self.rss_limit_mb:
+            return current
+
+        self.release()
+        gc.collect()
+        current = rss_mb()
+        if current <= self.rss_limit_mb:
+            return current
+
+        logger.error(
+            f"RSS {current:.0f} MB exceeds ceiling of {self.rss_limit_mb:.0f} MB"
+        )
+        for stage, top in self.stage_reports.items():
+            logger.error(f"  Top allocators in {stage}:")
+            for line in top:
+                logger.error(f"    {line}")
+        raise MemoryError(
+            f"RSS {current:.0f} MB exceeds ceiling of {self.rss_limit_mb:.0f} MB"
+        )
@@ -67,8 +67,6 @@ def structural_check(
     """Check the structure of CompanyFacts before finalizing.
     Pass each field as a string. Lists should be comma-separated items.
     Returns 'PASS' if all checks pass, or a description of issues found."""
-    issues = []
-
     # Parse comma-separated strings into lists
     news_items = (
         [x.strip() for x in recent_news.split(",") if x.strip()] if recent_news else []
@@ -84,6 +82,22 @@ def structural_check(
     source_items = (
         [x.strip() for x in sources.split(",") if x.strip()] if sources else []
     )
+    return structural_check_lists(
+        company_name, sector, news_items, fin_items, event_items, source_items
+    )
+
+
+def structural_check_lists(
+    company_name: str,
+    sector: str,
+    news_items: list[str],
+    fin_items: list[str],
+    event_items: list[str],
+    source_items: list[str],
+) -> str:
+    """structural_check on already-split lists (e.g. a CompanyFacts), so
+    items containing commas are counted once."""
+    issues = []
 
     if not company_name.strip():
         issues.append("company_name is empty")
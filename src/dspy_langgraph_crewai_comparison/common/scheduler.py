@@ -0,0 +1,205 @@
+"""Process-wide LM request scheduler.
+
+- Token buckets per provider/model for requests/min and tokens/min
+- Priority classes: waiting calls are served lowest priority value first
+  (interactive before batch), FIFO within a class
+- Per-run budget (tokens, wall clock) tracked in a context variable, so
+  every LM call made on behalf of a run — including calls from worker
+  threads that copy the context — is charged to it
+
+Framework-agnostic: dspy_impl/scheduling.py hooks it into dspy LM calls.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 10
+
+
+class TokenBucket:
+    """Continuously refilling bucket; `per_minute` is both rate and capacity.
+
+    Usage may be debited after the fact (actual output tokens), which can
+    push the level below zero; later callers then wait for the refill."""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(
+            self.per_minute, self.level + (now - self.updated) * self.per_minute / 60
+        )
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        self._refill()
+        amount = min(amount, self.per_minute)  # never wait for the impossible
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60 / self.per_minute
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+    def give(self, amount: float):
+        self._refill()
+        self.level = min(self.per_minute, self.level + amount)
+
+
+@dataclass
+class RateLimit:
+    rpm: float | None = None
+    tpm: float | None = None
+
+
+@dataclass
+class RunBudget:
+    """Per-run limits and usage; a limit of None means unlimited."""
+
+    priority: Priority = Priority.INTERACTIVE
+    max_tokens: int | None = None
+    max_seconds: float | None = None
+    started: float = field(default_factory=time.monotonic)
+    tokens: int = 0
+    lm_calls: int = 0
+    queue_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def charge(self, tokens: int = 0, queue_seconds: float = 0.0, calls: int = 0):
+        with self._lock:
+            self.tokens += tokens
+            self.queue_seconds += queue_seconds
+            self.lm_calls += calls
+
+    def exhausted(self) -> str | None:
+        """Why the budget is spent, or None if there is budget left."""
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            return f"token budget spent ({self.tokens}/{self.max_tokens})"
+        elapsed = time.monotonic() - self.started
+        if self.max_seconds is not None and elapsed >= self.max_seconds:
+            return f"time budget spent ({elapsed:.0f}s/{self.max_seconds:.0f}s)"
+        return None
+
+    def summary(self) -> dict:
+        return {
+            "priority": self.priority.name.lower(),
+            "lm_calls": self.lm_calls,
+            "tokens_est": self.tokens,
+            "queue_seconds": round(self.queue_seconds, 3),
+            "elapsed_seconds": round(time.monotonic() - self.started, 3),
+            "max_tokens": self.max_tokens,
+            "max_seconds": self.max_seconds,
+            "budget_exhausted": self.exhausted(),
+        }
+
+
+_current_run: ContextVar[RunBudget | None] = ContextVar("current_run", default=None)
+
+
+def current_run() -> RunBudget | None:
+    return _current_run.get()
+
+
+@contextmanager
+def run_scope(budget: RunBudget):
+    """Charge LM calls made inside the block to `budget`."""
+    token = _current_run.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_run.reset(token)
+
+
+class RateLimitScheduler:
+    """Blocks LM calls until their model's buckets allow them.
+
+    `limits` keys are a full model name ("openai/gpt-4o") or a provider
+    prefix ("openai"); a model without a matching key uses `default`."""
+
+    def __init__(
+        self,
+        limits: dict[str, RateLimit] | None = None,
+        default: RateLimit | None = None,
+    ):
+        self.limits = limits or {}
+        self.default = default or RateLimit()
+        self._cond = threading.Condition()
+        self._buckets: dict[str, tuple[TokenBucket | None, TokenBucket | None]] = {}
+        self._waiting: dict[str, list[tuple[int, int]]] = {}
+        self._seq = itertools.count()
+
+    def _key(self, model: str) -> str:
+        if model in self.limits:
+            return model
+        provider = model.split("/")[0]
+        return provider if provider in self.limits else "*"
+
+    def _buckets_for(self, key: str):
+        if key not in self._buckets:
+            limit = self.limits.get(key, self.default)
+            self._buckets[key] = (
+                TokenBucket(limit.rpm) if limit.rpm else None,
+                TokenBucket(limit.tpm) if limit.tpm else None,
+            )
+        return self._buckets[key]
+
+    def acquire(self, model: str, tokens: int, priority: Priority) -> float:
+        """Wait for capacity; returns the queueing delay in seconds."""
+        key = self._key(model)
+        t0 = time.monotonic()
+        with self._cond:
+            requests, token_bucket = self._buckets_for(key)
+            if requests is None and token_bucket is None:
+                return 0.0
+            ticket = (int(priority), next(self._seq))
+            waiting = self._waiting.setdefault(key, [])
+            heapq.heappush(waiting, ticket)
+            while True:
+                if waiting[0] != ticket:
+                    self._cond.wait()
+                    continue
+                wait = max(
+                    requests.wait_time(1) if requests else 0.0,
+                    token_bucket.wait_time(tokens) if token_bucket else 0.0,
+                )
+                if wait <= 0:
+                    break
+                self._cond.wait(timeout=wait)
+            heapq.heappop(waiting)
+            if requests:
+                requests.take(1)
+            if token_bucket:
+                token_bucket.take(tokens)
+            self._cond.notify_all()
+        return time.monotonic() - t0
+
+    def debit(self, model: str, tokens: int):
+        """Charge tokens known only after the call (e.g. the completion)."""
+        with self._cond:
+            _, token_bucket = self._buckets_for(self._key(model))
+            if token_bucket:
+                token_bucket.take(tokens)
+
+    def refund(self, model: str, tokens: int):
+        """Return an acquired request and its tokens (e.g. a cache hit)."""
+        with self._cond:
+            requests, token_bucket = self._buckets_for(self._key(model))
+            if requests:
+                requests.give(1)
+            if token_bucket:
+                token_bucket.give(tokens)
+            self._cond.notify_all()
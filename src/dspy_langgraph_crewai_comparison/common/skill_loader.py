@@ -4,6 +4,7 @@ Uses skills-ref to parse frontmatter, then exposes tools for progressive
 disclosure: the agent sees metadata at startup, reads SKILL.md body on
 demand, and accesses references/scripts as needed."""
 
+import contextvars
 import subprocess
 import sys
 from pathlib import Path
@@ -12,6 +13,8 @@ from loguru import logger
 
 from skills_ref import read_properties, to_prompt, validate
 
+from dspy_langgraph_crewai_comparison.common.tracing import span
+
 
 @dataclass
 class SkillTracker:
@@ -89,12 +92,17 @@ class SkillTracker:
 
 
 class SkillLoader:
-    """Loads and serves an Agent Skill with progressive disclosure."""
+    """Loads and serves an Agent Skill with progressive disclosure.
+
+    The tracker lives in a context variable, so runs in different threads
+    (batch evaluation, the server) each see their own SkillTracker."""
 
     def __init__(self, skill_dir: str | Path):
         self.skill_dir = Path(skill_dir)
         self.skill_md_path = self.skill_dir / "SKILL.md"
-        self.tracker = SkillTracker()
+        self._tracker: contextvars.ContextVar[SkillTracker | None] = (
+            contextvars.ContextVar(f"skill_tracker_{id(self)}", default=None)
+        )
 
         if not self.skill_md_path.exists():
             raise FileNotFoundError(f"No SKILL.md found in {self.skill_dir}")
@@ -109,6 +117,25 @@ class SkillLoader:
             f"{self.properties.description[:80]}..."
         )
 
+    def __deepcopy__(self, memo):
+        # The agent's tool closures hold this instance, so program copies
+        # (dspy deepcopy, GEPA candidates) must share it rather than clone it.
+        return self
+
+    @property
+    def tracker(self) -> SkillTracker:
+        tracker = self._tracker.get()
+        if tracker is None:
+            tracker = SkillTracker()
+            self._tracker.set(tracker)
+        return tracker
+
+    def reset_tracker(self) -> SkillTracker:
+        """Start a fresh tracker for the next run; returns the previous one."""
+        previous = self.tracker
+        self._tracker.set(SkillTracker())
+        return previous
+
     def get_system_prompt_xml(self) -> str:
         """Generate <available_skills> XML for injection into system prompt."""
         return to_prompt([self.skill_dir])
@@ -157,13 +184,16 @@ class SkillLoader:
 
         self.tracker.scripts_executed.append(name)
         try:
-            result = subprocess.run(
-                [sys.executable, str(script_path)],
-                input=input_data,
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
+            with span("skill.run_script", cat="subprocess", script=name) as attrs:
+                result = subprocess.run(
+                    [sys.executable, str(script_path)],
+                    input=input_data,
+                    capture_output=True,
+                    text=True,
+                    timeout=30,
+                )
+                if attrs is not None:
+                    attrs["returncode"] = result.returncode
             output = result.stdout.strip()
             if result.returncode != 0:
                 output += f"\nSTDERR: {result.stderr.strip()}"
@@ -7,8 +7,19 @@ Query tiers:
 - Targeted query ("Apple quarterly earnings") → full results
 - Sector-specific query from search-strategies.md → full results + bonus
 - Bad source included to test validate_sources.py
+
+Set MOCK_CORPUS_DIR (or call use_corpus()) to also serve companies from a
+synthetic corpus generated by common/corpus.py.
 """
 
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from dspy_langgraph_crewai_comparison.common.corpus import SyntheticCorpus
+
 MOCK_DATA = {
     "apple": {
         "news": [
@@ -121,17 +132,109 @@ MOCK_DATA = {
 }
 
 
+@lru_cache(maxsize=1024)
+def _keyword_pattern(keyword: str) -> re.Pattern:
+    # Whole words only (plurals allowed), so "EDA" doesn't fire on "Medan"
+    return re.compile(rf"\b{re.escape(keyword.lower())}(?:s|es)?\b")
+
+
+def _mentions(query_lower: str, keyword: str) -> bool:
+    return _keyword_pattern(keyword).search(query_lower) is not None
+
+
 def _query_tier(query_lower: str, data: dict) -> str:
     """Determine query quality: 'vague', 'targeted', or 'sector'."""
     for kw in data["keywords_sector"]:
-        if kw.lower() in query_lower:
+        if _mentions(query_lower, kw):
             return "sector"
     for kw in data["keywords_targeted"]:
-        if kw.lower() in query_lower:
+        if _mentions(query_lower, kw):
             return "targeted"
     return "vague"
 
 
+_corpus: SyntheticCorpus | None = None
+_corpus_lock = threading.Lock()
+
+
+def use_corpus(corpus_dir: str | Path | None) -> SyntheticCorpus | None:
+    """Serve web_search from a synthetic corpus (None to disable).
+
+    Closes the previous corpus, so swap corpora between runs, not while
+    searches are in flight."""
+    global _corpus
+    with _corpus_lock:
+        if _corpus is not None:
+            _corpus.close()
+        _corpus = SyntheticCorpus(corpus_dir) if corpus_dir else None
+        return _corpus
+
+
+def _get_corpus() -> SyntheticCorpus | None:
+    """The active corpus, opened from MOCK_CORPUS_DIR on first use (once,
+    even when the first searches arrive concurrently)."""
+    global _corpus
+    if _corpus is None and os.getenv("MOCK_CORPUS_DIR"):
+        with _corpus_lock:
+            if _corpus is None:
+                _corpus = SyntheticCorpus(os.getenv("MOCK_CORPUS_DIR"))
+    return _corpus
+
+
+def _find_company(query_lower: str) -> tuple[str, dict] | None:
+    for company, data in MOCK_DATA.items():
+        if company in query_lower:
+            return company, data
+    if (corpus := _get_corpus()) is not None:
+        return corpus.find(query_lower)
+    return None
+
+
+def _format_results(company: str, data: dict, query_lower: str) -> str:
+    tier = _query_tier(query_lower, data)
+    results = []
+
+    # --- News: always returned ---
+    results.append(f"=== Recent News for {company.title()} ===")
+    for item in data["news"]:
+        results.append(f"- {item}")
+
+    # --- Financials: only for targeted/sector ---
+    if tier in ("targeted", "sector"):
+        results.append("\n=== Financial Highlights ===")
+        for item in data["financials"]:
+            results.append(f"- {item}")
+
+    # --- Events: only for targeted/sector ---
+    if tier in ("targeted", "sector"):
+        results.append("\n=== Key Events ===")
+        for item in data["events"]:
+            results.append(f"- {item}")
+
+    # --- Bonus: only for sector-specific queries ---
+    if tier == "sector":
+        results.append("\n=== Additional Insights ===")
+        for item in data["bonus"]:
+            results.append(f"- {item}")
+
+    # --- Sources: bad source included for vague/targeted ---
+    results.append("\n=== Sources ===")
+    for url in data["sources_good"]:
+        results.append(f"- {url}")
+    if tier != "sector":
+        for url in data["sources_bad"]:
+            results.append(f"- {url}")
+
+    # --- Hint for vague queries ---
+    if tier == "vague":
+        results.append(
+            "\n⚠️ Limited results. Try a more specific query "
+            "(e.g., include 'quarterly earnings', 'revenue', or sector-specific terms)."
+        )
+
+    return "\n".join(results)
+
+
 def web_search(query: str) -> str:
     """Mock web search with query-quality sensitivity.
 
@@ -142,49 +245,7 @@ def web_search(query: str) -> str:
     In Part 3, this will be replaced by a real MCP web_search tool."""
     query_lower = query.lower()
 
-    for company, data in MOCK_DATA.items():
-        if company in query_lower:
-            tier = _query_tier(query_lower, data)
-            results = []
-
-            # --- News: always returned ---
-            results.append(f"=== Recent News for {company.title()} ===")
-            for item in data["news"]:
-                results.append(f"- {item}")
-
-            # --- Financials: only for targeted/sector ---
-            if tier in ("targeted", "sector"):
-                results.append("\n=== Financial Highlights ===")
-                for item in data["financials"]:
-                    results.append(f"- {item}")
-
-            # --- Events: only for targeted/sector ---
-            if tier in ("targeted", "sector"):
-                results.append("\n=== Key Events ===")
-                for item in data["events"]:
-                    results.append(f"- {item}")
-
-            # --- Bonus: only for sector-specific queries ---
-            if tier == "sector":
-                results.append("\n=== Additional Insights ===")
-                for item in data["bonus"]:
-                    results.append(f"- {item}")
-
-            # --- Sources: bad source included for vague/targeted ---
-            results.append("\n=== Sources ===")
-            for url in data["sources_good"]:
-                results.append(f"- {url}")
-            if tier != "sector":
-                for url in data["sources_bad"]:
-                    results.append(f"- {url}")
-
-            # --- Hint for vague queries ---
-            if tier == "vague":
-                results.append(
-                    "\n⚠️ Limited results. Try a more specific query "
-                    "(e.g., include 'quarterly earnings', 'revenue', or sector-specific terms)."
-                )
-
-            return "\n".join(results)
-
-    return f"No results found for: {query}"
+    match = _find_company(query_lower)
+    if match is None:
+        return f"No results found for: {query}"
+    return _format_results(*match, query_lower)
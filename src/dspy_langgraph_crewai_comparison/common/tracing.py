@@ -0,0 +1,110 @@
+"""Span tracing, exported as Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+- span(): context manager around a unit of work; a no-op unless a Tracer
+  is active in the current context, so instrumentation can stay in place
+- use_tracer(): activates a Tracer for the block. Worker threads that copy
+  the context (ParallelReviewer, the evaluator) record into the same one,
+  so a batch of runs shares a single timeline
+- Tracer.save(): writes {"traceEvents": [...]} with one complete ("X")
+  event per span; Perfetto nests spans of the same thread by time
+
+Each event carries the process and native thread ID, plus the span's
+attributes as `args`.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+
+class Tracer:
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._events: list[dict] = []
+        self._threads: dict[int, str] = {}
+
+    def __deepcopy__(self, memo):
+        # Shared by copies of the programs it traces (e.g. GEPA candidates).
+        return self
+
+    def now_us(self) -> float:
+        return (time.perf_counter_ns() - self.origin) / 1000
+
+    def complete(self, name: str, cat: str, start_us: float, args: dict | None = None):
+        """Record a span that started at `start_us` and ends now."""
+        tid = threading.get_native_id()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round(start_us, 3),
+            "dur": round(self.now_us() - start_us, 3),
+            "pid": self.pid,
+            "tid": tid,
+            "args": args or {},
+        }
+        with self._lock:
+            self._events.append(event)
+            self._threads.setdefault(tid, threading.current_thread().name)
+
+    def to_json(self) -> dict:
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, default=str)
+        return path
+
+
+_current_tracer: ContextVar[Tracer | None] = ContextVar("tracer", default=None)
+
+
+def current_tracer() -> Tracer | None:
+    return _current_tracer.get()
+
+
+@contextmanager
+def use_tracer(tracer: Tracer):
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, cat: str = "pipeline", **attrs):
+    """Record the block as a span; yields the attrs dict (or None when not
+    tracing) so the block can attach results."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    start = tracer.now_us()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        tracer.complete(name, cat, start, attrs)
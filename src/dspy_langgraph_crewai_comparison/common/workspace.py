@@ -8,25 +8,30 @@ from typing import Any
 
 from loguru import logger
 
+from dspy_langgraph_crewai_comparison.common.tracing import span
+
 
 class Workspace:
-    def __init__(self, workspace_dir: str = "./workspace"):
+    def __init__(self, workspace_dir: str = "./workspace", run_id: str | None = None):
         self.workspace_dir = Path(workspace_dir)
-        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
         self.run_dir = self.workspace_dir / self.run_id
         self.run_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"📂 Workspace: {self.run_dir}")
 
     def dump(self, name: str, data: Any, as_pickle: bool = False) -> Path:
         """Dump data to workspace."""
-        if as_pickle:
-            filepath = self.run_dir / f"{name}.pkl"
-            with open(filepath, "wb") as f:
-                pickle.dump(data, f)
-        else:
-            filepath = self.run_dir / f"{name}.json"
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        with span("workspace.dump", cat="io", file=name) as attrs:
+            if as_pickle:
+                filepath = self.run_dir / f"{name}.pkl"
+                with open(filepath, "wb") as f:
+                    pickle.dump(data, f)
+            else:
+                filepath = self.run_dir / f"{name}.json"
+                with open(filepath, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            if attrs is not None:
+                attrs["bytes"] = filepath.stat().st_size
         logger.info(f"  💾 Saved: {filepath.name}")
         return filepath
 
@@ -0,0 +1,334 @@
+"""GEPA optimization of the DSPy Company Research Pipeline.
+
+Evaluation set: the MOCK_DATA companies, optionally extended with a sample
+from a synthetic corpus (common/corpus.py). The metric combines the
+reviewer's ratios with the SkillTracker scores and returns textual
+feedback for GEPA's reflection step.
+
+Candidate programs are scored in parallel (threads: the work is LM-bound)
+and every (program state, example) result is cached, so a candidate GEPA
+proposes twice, or re-scores on the validation set, is never re-run.
+The baseline and final evaluations use ParallelEvaluator (--threads);
+GEPA scores candidates with its own thread pool of the same size.
+benchmarks/bench_optimize_workers.py shows wall time against worker count.
+
+The train and validation sets never overlap: with only the 3 mock
+companies that is 1 train / 2 val, so add --corpus/--size for a
+meaningful run.
+
+Usage:
+    python -m dspy_impl.optimize                       # 3 mock companies
+    python -m dspy_impl.optimize --corpus ./corpus --size 30 --threads 16
+"""
+
+import argparse
+import contextvars
+import hashlib
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+import dspy
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.common.scheduler import Priority
+from dspy_langgraph_crewai_comparison.common.tools import MOCK_DATA, use_corpus
+from dspy_langgraph_crewai_comparison.common.tracing import (
+    Tracer,
+    current_tracer,
+    span,
+    use_tracer,
+)
+from dspy_langgraph_crewai_comparison.common.workspace import Workspace
+from dspy_langgraph_crewai_comparison.dspy_impl.pipeline import (
+    CompanyResearchPipeline,
+)
+from dspy_langgraph_crewai_comparison.dspy_impl.run import (
+    add_memory_args,
+    configure_lm,
+    configure_mcp,
+    configure_memory_from_args,
+    configure_scheduler,
+    make_lm,
+    provider_settings,
+)
+from dspy_langgraph_crewai_comparison.dspy_impl.tracing import trace_scope
+
+METRIC_WEIGHTS = {
+    "accuracy": 0.35,
+    "completeness": 0.25,
+    "conciseness": 0.10,
+    "skill": 0.30,
+}
+
+
+def build_devset(
+    corpus_dir: str | None = None, size: int = 0, seed: int = 0
+) -> list[dspy.Example]:
+    """MOCK_DATA companies, plus `size` companies sampled from a corpus
+    (all of them if it has fewer)."""
+    companies = [name.title() for name in MOCK_DATA]
+    if corpus_dir and size:
+        corpus = use_corpus(corpus_dir)
+        if size > len(corpus):
+            logger.warning(f"Corpus has only {len(corpus)} companies, using all")
+            size = len(corpus)
+        names = random.Random(seed).sample(sorted(corpus.index), size)
+        companies += [corpus.get(name)["name"] for name in names]
+    return [dspy.Example(company_name=c).with_inputs("company_name") for c in companies]
+
+
+def split_devset(
+    devset: list[dspy.Example],
+) -> tuple[list[dspy.Example], list[dspy.Example]]:
+    """Disjoint (train, val) halves, so GEPA is never scored on the
+    examples it reflects on."""
+    if len(devset) < 2:
+        raise ValueError("Need at least 2 companies for disjoint train/val sets")
+    if len(devset) < 6:
+        logger.warning(
+            f"Only {len(devset)} companies: validation scores will be noisy "
+            "(add --corpus DIR --size N)"
+        )
+    half = len(devset) // 2
+    return devset[:half], devset[half:]
+
+
+def research_metric(gold, pred, trace=None, pred_name=None, pred_trace=None):
+    """Weighted review + skill-usage score, with feedback for GEPA."""
+    review = pred.review
+    tracker = pred.skill_tracker
+    score = (
+        METRIC_WEIGHTS["accuracy"] * review.accuracy_ratio
+        + METRIC_WEIGHTS["completeness"] * review.completeness_ratio
+        + METRIC_WEIGHTS["conciseness"] * review.conciseness_rating / 5
+        + METRIC_WEIGHTS["skill"] * tracker["scores"]["overall"]
+    )
+
+    feedback = [
+        f"Score {score:.2f} (accuracy {review.accuracy_ratio:.0%}, "
+        f"completeness {review.completeness_ratio:.0%}, "
+        f"conciseness {review.conciseness_rating}/5, "
+        f"skill usage {tracker['scores']['overall']:.0%})."
+    ]
+    if not tracker["skill_read"]:
+        feedback.append("The skill instructions were never read.")
+    for key, label in (
+        ("references_missed", "Unread references"),
+        ("scripts_missed", "Scripts not run"),
+        ("tools_missed", "Tools not called"),
+    ):
+        if tracker[key]:
+            feedback.append(f"{label}: {', '.join(tracker[key])}.")
+    feedback += [f"Review issue: {issue}" for issue in review.issues]
+    if review.feedback:
+        feedback.append(f"Reviewer feedback: {review.feedback}")
+
+    return dspy.Prediction(score=score, feedback="\n".join(feedback))
+
+
+class ResultCache:
+    """Thread-safe (program state, inputs) → (prediction, trace) cache.
+
+    Concurrent requests for the same key wait on the first one instead of
+    re-running it. Shared by every program copy GEPA makes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: dict[str, Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def get_or_run(self, key: str, run) -> tuple[dspy.Prediction, list]:
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                future.set_result(run())
+            except Exception as e:
+                # Don't cache failures (e.g. provider errors); let a later
+                # call retry.
+                with self._lock:
+                    del self._results[key]
+                future.set_exception(e)
+        return future.result()
+
+
+def program_key(program: dspy.Module) -> str:
+    state = json.dumps(program.dump_state(), sort_keys=True, default=str)
+    return hashlib.sha256(state.encode("utf-8")).hexdigest()[:16]
+
+
+class CachedProgram(dspy.Module):
+    """Wraps a program so each (state, inputs) pair runs at most once.
+
+    The predictor trace of the original run is stored and replayed on a
+    hit, so GEPA can still build reflective examples from cached runs."""
+
+    def __init__(
+        self, program: dspy.Module, cache: ResultCache, tracer: Tracer | None = None
+    ):
+        self.program = program
+        self.cache = cache
+        # GEPA's worker threads don't inherit context variables, so runs
+        # re-activate the tracer themselves.
+        self.tracer = tracer
+
+    def forward(self, **kwargs):
+        key = f"{program_key(self.program)}:{json.dumps(kwargs, sort_keys=True)}"
+
+        def run():
+            with dspy.context(trace=[]):
+                prediction = self.program(**kwargs)
+                return prediction, list(dspy.settings.trace)
+
+        tracing = self.tracer is not None and current_tracer() is None
+        with use_tracer(self.tracer) if tracing else nullcontext():
+            prediction, trace = self.cache.get_or_run(key, run)
+        if dspy.settings.trace is not None:
+            dspy.settings.trace.extend(trace)
+        return prediction
+
+
+@dataclass
+class EvaluationReport:
+    score: float
+    seconds: float
+    results: list[dict] = field(default_factory=list)
+
+
+class ParallelEvaluator:
+    """Scores a program on a devset with a thread pool."""
+
+    def __init__(self, metric=research_metric, num_threads: int = 8):
+        self.metric = metric
+        self.num_threads = num_threads
+
+    def _score(self, program: dspy.Module, example: dspy.Example) -> dict:
+        try:
+            prediction = program(**example.inputs())
+            result = self.metric(example, prediction)
+            return {
+                "company": example.company_name,
+                "score": float(result.score),
+                "feedback": result.feedback,
+            }
+        except MemoryError:
+            # Over the RSS ceiling: stop rather than score refused runs as 0.
+            raise
+        except Exception as e:
+            logger.warning(f"Evaluation failed for {example.company_name}: {e}")
+            return {"company": example.company_name, "score": 0.0, "error": str(e)}
+
+    def __call__(
+        self, program: dspy.Module, devset: list[dspy.Example]
+    ) -> EvaluationReport:
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.num_threads) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._score, program, ex)
+                for ex in devset
+            ]
+            results = [f.result() for f in futures]
+        score = sum(r["score"] for r in results) / len(results) if results else 0.0
+        return EvaluationReport(score, time.perf_counter() - t0, results)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m dspy_impl.optimize",
+        description="GEPA-optimize the DSPy Company Research Pipeline.",
+    )
+    parser.add_argument("--corpus", help="Synthetic corpus dir to sample from")
+    parser.add_argument("--size", type=int, default=0, help="Companies to sample")
+    parser.add_argument("--threads", type=int, default=8, help="Parallel runs")
+    parser.add_argument("--auto", default="light", choices=["light", "medium", "heavy"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--parallel-review", action="store_true")
+    parser.add_argument("--rpm", type=float, help="Requests/min per model")
+    parser.add_argument("--tpm", type=float, help="Tokens/min per model")
+    add_memory_args(parser)
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Trace the evaluations and GEPA's compile into one trace.json",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+
+    configure_lm()
+    configure_scheduler(rpm=args.rpm, tpm=args.tpm)
+    # GEPA reflects on whole-program traces: bound history, not the trace
+    memory = configure_memory_from_args(args, bound_trace=False)
+    _, strong, _, _ = provider_settings()
+    ws = Workspace()
+
+    devset = build_devset(args.corpus, args.size, seed=args.seed)
+    trainset, valset = split_devset(devset)
+    logger.info(f"Eval set: {len(trainset)} train / {len(valset)} val companies")
+
+    cache = ResultCache()
+    mcp = configure_mcp()
+    tracer = Tracer() if args.trace else None
+    student = CachedProgram(
+        CompanyResearchPipeline(
+            parallel_review=args.parallel_review,
+            memory=memory,
+            priority=Priority.BATCH,
+            mcp=mcp,
+        ),
+        cache,
+        tracer=tracer,
+    )
+    evaluator = ParallelEvaluator(num_threads=args.threads)
+
+    with trace_scope(tracer) if tracer else nullcontext():
+        with span("evaluate.baseline", cat="optimize"):
+            baseline = evaluator(student, valset)
+        logger.info(f"Baseline: {baseline.score:.3f} ({baseline.seconds:.1f}s)")
+        ws.dump("01_baseline_eval", baseline.__dict__)
+
+        optimizer = dspy.GEPA(
+            metric=research_metric,
+            auto=args.auto,
+            num_threads=args.threads,
+            reflection_lm=make_lm(strong),
+            seed=args.seed,
+        )
+        t0 = time.perf_counter()
+        with span("gepa.compile", cat="optimize", threads=args.threads):
+            optimized = optimizer.compile(student, trainset=trainset, valset=valset)
+        logger.info(f"Compile: {time.perf_counter() - t0:.1f}s")
+
+        with span("evaluate.final", cat="optimize"):
+            final = evaluator(optimized, valset)
+    logger.info(f"Optimized: {final.score:.3f} ({final.seconds:.1f}s)")
+    logger.info(f"Cache: {cache.hits} hits / {cache.misses} runs")
+    ws.dump("02_optimized_eval", final.__dict__)
+    ws.dump("03_cache_stats", {"hits": cache.hits, "misses": cache.misses})
+    if tracer:
+        tracer.save(ws.run_dir / "trace.json")
+    optimized.program.save(str(ws.run_dir / "optimized_program.json"))
+    logger.info(f"Saved optimized program to {ws.run_dir}")
+    if mcp:
+        mcp.close()
+
+
+if __name__ == "__main__":
+    main()
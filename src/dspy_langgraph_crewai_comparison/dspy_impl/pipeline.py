@@ -1,28 +1,64 @@
+from contextlib import nullcontext
 from pathlib import Path
 
 import dspy
 from loguru import logger
 
-from dspy_langgraph_crewai_comparison.common.models import structural_check
+from dspy_langgraph_crewai_comparison.common.mcp_client import MCPClientPool
+from dspy_langgraph_crewai_comparison.common.memory import MemoryGuard
+from dspy_langgraph_crewai_comparison.common.models import (
+    structural_check,
+    structural_check_lists,
+)
+from dspy_langgraph_crewai_comparison.common.scheduler import (
+    Priority,
+    RunBudget,
+    run_scope,
+)
 from dspy_langgraph_crewai_comparison.common.skill_loader import SkillLoader
 from dspy_langgraph_crewai_comparison.common.tools import web_search
+from dspy_langgraph_crewai_comparison.common.tracing import (
+    Tracer,
+    current_tracer,
+    span,
+)
 from dspy_langgraph_crewai_comparison.common.workspace import Workspace
+from dspy_langgraph_crewai_comparison.dspy_impl.researcher import ResearcherReAct
+from dspy_langgraph_crewai_comparison.dspy_impl.reviewer import ParallelReviewer
+from dspy_langgraph_crewai_comparison.dspy_impl.routing import (
+    LatencyBaselines,
+    StageRoute,
+    StageRouter,
+)
 from dspy_langgraph_crewai_comparison.dspy_impl.signature import (
     ResearchCompany,
     WriteAnalystSummary,
     ReviewSummary,
 )
+from dspy_langgraph_crewai_comparison.dspy_impl.tracing import trace_scope
 
 SKILL_DIR = Path(__file__).parent.parent / "common" / "skills" / "company-researcher"
 
 
-def make_skill_tools(skill: SkillLoader):
-    """Create tool functions for the ReAct researcher agent."""
+def make_skill_tools(skill: SkillLoader, mcp: MCPClientPool | None = None):
+    """Create tool functions for the ReAct researcher agent.
+
+    With an MCP pool, `search` goes to its "search" server instead of the
+    mock web_search, and a "python" server adds a run_python tool (one
+    REPL session per pipeline run)."""
 
     def search(query: str) -> str:
         """Search the web for company information."""
+        if mcp and mcp.has("search"):
+            return mcp.call_tool("search", {"query": query})
         return web_search(query)
 
+    def run_python(code: str) -> str:
+        """Execute Python code in a REPL and return its output. Variables
+        persist between calls. Use it for calculations on the figures you
+        found."""
+        return mcp.call_tool("python", {"code": code})
+
     def read_skill_instructions() -> str:
         """Read the full SKILL.md instructions for the company-researcher skill.
         Call this first to understand how to research a company properly."""
@@ -60,7 +96,7 @@ def make_skill_tools(skill: SkillLoader):
             company_name, sector, recent_news, financial_highlights, key_events, sources
         )
 
-    return [
+    tools = [
         search,
         read_skill_instructions,
         read_reference,
@@ -68,6 +104,23 @@ def make_skill_tools(skill: SkillLoader):
         read_asset,
         check_structure,
     ]
+    if mcp and mcp.has("python"):
+        tools.append(run_python)
+    return tools
+
+
+def check_facts(result: dspy.Prediction) -> str | None:
+    """Escalation check for the researcher: None if structural_check passes."""
+    facts = result.company_facts
+    verdict = structural_check_lists(
+        facts.company_name,
+        facts.sector,
+        facts.recent_news,
+        facts.financial_highlights,
+        facts.key_events,
+        facts.sources,
+    )
+    return None if verdict.startswith("PASS") else verdict
 
 
 class CompanyResearchPipeline(dspy.Module):
@@ -76,54 +129,187 @@ class CompanyResearchPipeline(dspy.Module):
 
     No review loop — the Researcher self-checks via tools.
     Reviewer provides evaluation data for GEPA optimization in Part 4.
+
+    `routes` maps stage name → StageRoute. A stage with a fallback LM runs
+    on its fast model first and escalates when the output fails to parse,
+    structural_check fails (researcher) or the judge rejects it (writer).
+    With a cascaded writer, that judge runs on the reviewer's strong model.
+    `baselines` (shared LatencyBaselines) estimate the latency saved.
+
+    `parallel_review` swaps the single ReviewSummary call for
+    ParallelReviewer (extract claims, verify them concurrently).
+
+    With a `memory` guard, the RSS ceiling is checked before a run starts
+    (MemoryError: the run is refused, no work is lost), each stage's
+    allocations can be traced, and per-run state (tracker, routing events,
+    LM history beyond the cap) is released once the run is persisted.
+
+    Every run gets a RunBudget: its LM calls queue in the rate-limit
+    scheduler at `priority`, and once `token_budget` or `time_budget_s` is
+    spent the researcher stops searching and extracts what it has, and the
+    writer is no longer escalated.
+
+    With `trace`, the run's spans are written to trace.json in its
+    workspace directory (Chrome trace-event format, open in Perfetto).
+    Inside an outer trace_scope (a traced batch), they go to that tracer
+    instead, so the whole batch shares one timeline.
+
+    `mcp` serves the researcher's search (and run_python) tools from pooled
+    MCP sessions; pass the same MCPClientPool to every pipeline. Each run
+    gets a REPL session of its own, discarded when the run ends.
     """
 
-    def __init__(self, max_iterations: int = 3, workspace: Workspace | None = None):
+    def __init__(
+        self,
+        max_iterations: int = 3,
+        workspace: Workspace | None = None,
+        routes: dict[str, StageRoute] | None = None,
+        baselines: LatencyBaselines | None = None,
+        parallel_review: bool = False,
+        max_parallel_claims: int = 4,
+        memory: MemoryGuard | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        token_budget: int | None = None,
+        time_budget_s: float | None = None,
+        trace: bool = False,
+        mcp: MCPClientPool | None = None,
+    ):
         self.skill = SkillLoader(SKILL_DIR)
 
         # Researcher: ReAct agent with all tools (agentic)
-        self.researcher = dspy.ReAct(
+        self.researcher = ResearcherReAct(
             ResearchCompany,
-            tools=make_skill_tools(self.skill),
+            tools=make_skill_tools(self.skill, mcp),
             max_iters=10,
         )
 
         # Writer & Reviewer: ChainOfThought (not agentic)
         self.writer = dspy.ChainOfThought(WriteAnalystSummary)
-        self.reviewer = dspy.ChainOfThought(ReviewSummary)
+        if parallel_review:
+            self.reviewer = ParallelReviewer(max_parallel=max_parallel_claims)
+        else:
+            self.reviewer = dspy.ChainOfThought(ReviewSummary)
 
         self.ws = workspace
+        self.router = StageRouter(routes, baselines)
+        self.memory = memory
+        self.priority = priority
+        self.token_budget = token_budget
+        self.time_budget_s = time_budget_s
+        self.trace = trace
+        self.mcp = mcp
 
     def _dump(self, name: str, data):
         if self.ws:
             payload = data.model_dump() if hasattr(data, "model_dump") else data
             self.ws.dump(name, payload)
 
+    def _stage(self, name: str):
+        return self.memory.stage(name) if self.memory else nullcontext()
+
+    def _release(self):
+        """Drop per-run state once outputs are persisted (bounded mode)."""
+        if self.memory:
+            self.skill.reset_tracker()
+            self.router.start_run()
+            self.memory.release()
+
+    def _repl_session(self):
+        if self.mcp and self.mcp.has("python"):
+            return self.mcp.run_session("python")
+        return nullcontext()
+
     def forward(self, company_name: str):
+        if self.memory:
+            self.memory.check()
+        budget = RunBudget(self.priority, self.token_budget, self.time_budget_s)
+        tracer = None
+        if self.trace and self.ws and current_tracer() is None:
+            tracer = Tracer()
+        with (
+            run_scope(budget),
+            self._repl_session(),
+            trace_scope(tracer) if tracer else nullcontext(),
+            span(
+                "pipeline",
+                company=company_name,
+                run_id=self.ws.run_id if self.ws else None,
+                priority=budget.priority.name.lower(),
+            ),
+        ):
+            result = self._research(company_name, budget)
+        if tracer:
+            path = tracer.save(self.ws.run_dir / "trace.json")
+            logger.info(f"  🧵 Trace: {path}")
+        return result
+
+    def _review(self, summary, facts):
+        # The review decides whether the writer escalates. A fast judge
+        # could approve weak fast output, so with a cascaded writer the
+        # judge runs on the reviewer's strong model.
+        call = (
+            self.router.call_strong
+            if self.router.can_escalate("writer")
+            else self.router.call
+        )
+        return call(
+            "reviewer", self.reviewer, analyst_summary=summary, company_facts=facts
+        ).review
+
+    def _research(self, company_name: str, budget: RunBudget):
+        self.router.start_run()
+        self.skill.reset_tracker()
+
         # — Step 1: Researcher (agentic) —
         skill_metadata = self.skill.get_metadata_prompt()
 
-        research_result = self.researcher(
-            company_name=company_name,
-            skill_metadata=skill_metadata,
-        )
+        with self._stage("researcher"):
+            research_result = self.router.call(
+                "researcher",
+                self.researcher,
+                check=check_facts,
+                # tool usage of the rejected fast attempt isn't this run's
+                on_escalate=self.skill.reset_tracker,
+                company_name=company_name,
+                skill_metadata=skill_metadata,
+            )
         facts = research_result.company_facts
+        del research_result  # drop the ReAct trajectory
         self._dump("01_company_facts", facts)
         self._dump("01b_skill_tracker", self.skill.tracker.summary())
 
         # — Step 2: Writer —
-        write_result = self.writer(company_facts=facts)
+        with self._stage("writer"):
+            write_result = self.router.call("writer", self.writer, company_facts=facts)
         summary = write_result.analyst_summary
         self._dump("02_summary", summary)
 
         # — Step 3: Reviewer (evaluation data for Part 4) —
-        review_result = self.reviewer(
-            analyst_summary=summary,
-            company_facts=facts,
-        )
-        review = review_result.review
+        with self._stage("reviewer"):
+            review = self._review(summary, facts)
         self._dump("03_review", review)
 
+        # — Cascade: a rejected fast-model summary is rewritten once on the
+        # strong model and reviewed again —
+        if (
+            not review.approved
+            and self.router.can_escalate("writer")
+            and not budget.exhausted()
+        ):
+            with self._stage("writer"):
+                write_result = self.router.escalate(
+                    "writer", self.writer, "judge rejected", company_facts=facts
+                )
+            summary = write_result.analyst_summary
+            self._dump("02_summary", summary)
+            with self._stage("reviewer"):
+                review = self._review(summary, facts)
+            self._dump("03_review", review)
+
+        routing = self.router.run_summary()
+        tracker = self.skill.tracker.summary()
+        scheduling = budget.summary()
+
         logger.info(
             f"Review: accuracy={review.accuracy_ratio:.2f} "
             f"completeness={review.completeness_ratio:.2f} "
@@ -138,13 +324,18 @@ class CompanyResearchPipeline(dspy.Module):
                 "company_facts": facts.model_dump(),
                 "analyst_summary": summary.model_dump(),
                 "review": review.model_dump(),
-                "skill_tracker": self.skill.tracker.summary(),
+                "skill_tracker": tracker,
+                "routing": routing,
+                "scheduling": scheduling,
             },
         )
+        self._release()
 
         return dspy.Prediction(
             company_facts=facts,
             analyst_summary=summary,
             review=review,
-            skill_tracker=self.skill.tracker.summary(),
+            skill_tracker=tracker,
+            routing=routing,
+            scheduling=scheduling,
         )
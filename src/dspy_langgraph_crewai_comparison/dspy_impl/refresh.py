@@ -0,0 +1,346 @@
+"""Incremental refresh of a watchlist, reusing prior research.
+
+For each company, a fixed set of probe queries is run through web_search
+and the results are fingerprinted. The result is then compared with the
+snapshot stored next to the last CompanyFacts/AnalystSummary in the
+workspace:
+
+- unchanged     → return the cached summary (no LM calls)
+- writer_only   → only news/sources changed (added or dropped off): merge
+                  them into the stored facts and update the summary with
+                  UpdateAnalystSummary
+- full          → financials/events were added or removed, no prior
+                  state, or the merged facts fail the researcher's checks
+                  (structural_check, validate_sources.py): run the full
+                  pipeline
+
+A company that fails is logged and listed under "failed" in the report;
+the rest of the watchlist still runs.
+
+Usage:
+    python -m dspy_impl.refresh                       # MOCK_DATA companies
+    python -m dspy_impl.refresh Apple Tesla --workspace-dir ./workspace
+    python -m dspy_impl.refresh --trace     # one merged trace for the batch
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+import dspy
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.common.models import (
+    AnalystSummary,
+    CompanyFacts,
+    structural_check_lists,
+)
+from dspy_langgraph_crewai_comparison.common.scheduler import (
+    Priority,
+    RunBudget,
+    run_scope,
+)
+from dspy_langgraph_crewai_comparison.common.tools import MOCK_DATA, web_search
+from dspy_langgraph_crewai_comparison.common.tracing import Tracer, span
+from dspy_langgraph_crewai_comparison.common.workspace import Workspace
+from dspy_langgraph_crewai_comparison.dspy_impl.pipeline import (
+    CompanyResearchPipeline,
+)
+from dspy_langgraph_crewai_comparison.dspy_impl.run import (
+    add_memory_args,
+    add_scheduler_args,
+    configure_lm,
+    configure_memory_from_args,
+    configure_scheduler,
+)
+from dspy_langgraph_crewai_comparison.dspy_impl.signature import UpdateAnalystSummary
+from dspy_langgraph_crewai_comparison.dspy_impl.tracing import trace_scope
+
+PROBE_QUERIES = ("{company}", "{company} quarterly earnings revenue")
+WRITER_ONLY_SECTIONS = {"news", "sources"}
+PATHS = ("unchanged", "writer_only", "full")
+
+_SECTIONS = {
+    "recent news": "news",
+    "financial highlights": "financials",
+    "key events": "events",
+    "additional insights": "insights",
+    "sources": "sources",
+}
+
+
+def search_snapshot(company: str) -> dict[str, list[str]]:
+    """Run the probe queries and group result items by section."""
+    snapshot: dict[str, list[str]] = {}
+    for query in PROBE_QUERIES:
+        section = None
+        for line in web_search(query.format(company=company)).splitlines():
+            if match := re.match(r"=== (.+?)(?: for .+)? ===", line.strip()):
+                section = _SECTIONS.get(match.group(1).lower())
+            elif section and line.startswith("- "):
+                items = snapshot.setdefault(section, [])
+                if line[2:] not in items:
+                    items.append(line[2:])
+    return snapshot
+
+
+def fingerprint(snapshot: dict[str, list[str]]) -> str:
+    canonical = json.dumps(
+        {section: sorted(items) for section, items in snapshot.items()},
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def diff_snapshots(
+    old: dict[str, list[str]], new: dict[str, list[str]]
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """(added, removed) items per section."""
+    added, removed = {}, {}
+    for section in old.keys() | new.keys():
+        before, after = set(old.get(section, [])), set(new.get(section, []))
+        if plus := [i for i in new.get(section, []) if i not in before]:
+            added[section] = plus
+        if minus := [i for i in old.get(section, []) if i not in after]:
+            removed[section] = minus
+    return added, removed
+
+
+def classify(
+    previous: dict | None, snapshot: dict[str, list[str]]
+) -> tuple[str, str, dict[str, list[str]], dict[str, list[str]]]:
+    """(path, reason, added, removed) for a new snapshot vs the stored state."""
+    if previous is None:
+        return "full", "no prior research", {}, {}
+    if previous["fingerprint"] == fingerprint(snapshot):
+        return "unchanged", "search results unchanged", {}, {}
+    added, removed = diff_snapshots(previous["snapshot"], snapshot)
+    changed = added.keys() | removed.keys()
+    if not changed <= WRITER_ONLY_SECTIONS:
+        return "full", f"changed sections: {sorted(changed)}", added, removed
+    reason = (
+        f"{sum(map(len, added.values()))} new, "
+        f"{sum(map(len, removed.values()))} dropped items"
+    )
+    return "writer_only", reason, added, removed
+
+
+def merge_delta(facts: CompanyFacts, added: dict, removed: dict) -> CompanyFacts:
+    """Stored facts with the news/sources delta applied (newest news first)."""
+    facts = facts.model_copy(deep=True)
+    dropped_news = set(removed.get("news", []))
+    kept_news = [n for n in facts.recent_news if n not in dropped_news]
+    facts.recent_news = (added.get("news", []) + kept_news)[:5]
+    dropped_sources = set(removed.get("sources", []))
+    facts.sources = [s for s in facts.sources if s not in dropped_sources]
+    facts.sources += [s for s in added.get("sources", []) if s not in facts.sources]
+    return facts
+
+
+def _slug(company: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", company.lower()).strip("-")
+
+
+class RefreshStore:
+    """Last research state per company: snapshot, facts, summary, review."""
+
+    def __init__(self, workspace_dir: str = "./workspace"):
+        self.workspace_dir = Path(workspace_dir)
+        self.state_dir = self.workspace_dir / "incremental"
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+    def load(self, company: str) -> dict | None:
+        path = self.state_dir / f"{_slug(company)}.json"
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, company: str, state: dict):
+        path = self.state_dir / f"{_slug(company)}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False, default=str)
+
+    def save_report(self, report: dict):
+        with open(self.state_dir / "refresh_report.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+class IncrementalRefresher:
+    def __init__(self, pipeline: CompanyResearchPipeline, store: RefreshStore):
+        self.pipeline = pipeline
+        self.store = store
+        self.updater = dspy.ChainOfThought(UpdateAnalystSummary)
+        self.counts: Counter = Counter()
+
+    def _workspace(self, company: str) -> Workspace:
+        run_id = f"{datetime.now():%Y%m%d_%H%M%S}_{_slug(company)}"
+        return Workspace(str(self.store.workspace_dir), run_id=run_id)
+
+    def refresh(self, company: str) -> dict:
+        snapshot = search_snapshot(company)
+        previous = self.store.load(company)
+        path, reason, added, removed = classify(previous, snapshot)
+        if path == "writer_only":
+            facts = merge_delta(
+                CompanyFacts(**previous["company_facts"]), added, removed
+            )
+            if issues := self._check_delta(facts, added):
+                path, reason = "full", f"delta failed checks: {issues}"
+
+        logger.info(f"🔁 {company}: {path} ({reason})")
+
+        with span("refresh", company=company, path=path):
+            if path == "unchanged":
+                state = previous
+            elif path == "writer_only":
+                state = self._update_summary(company, previous, facts, added)
+            else:
+                state = self._research(company)
+        state["fingerprint"] = fingerprint(snapshot)
+        state["snapshot"] = snapshot
+        state["refreshed_at"] = datetime.now().isoformat(timespec="seconds")
+        self.store.save(company, state)
+        self.counts[path] += 1
+        return {"company": company, "path": path, "reason": reason, **state}
+
+    def _check_delta(self, facts: CompanyFacts, added: dict) -> str | None:
+        """The researcher's own checks on the merged facts: structural_check,
+        and validate_sources.py on the new sources. None if they pass."""
+        verdict = structural_check_lists(
+            facts.company_name,
+            facts.sector,
+            facts.recent_news,
+            facts.financial_highlights,
+            facts.key_events,
+            facts.sources,
+        )
+        if not verdict.startswith("PASS"):
+            return verdict
+        if new_sources := added.get("sources"):
+            output = self.pipeline.skill.run_script(
+                "validate_sources.py", json.dumps(new_sources)
+            )
+            try:
+                invalid = json.loads(output)["invalid"]
+            except (ValueError, KeyError):
+                return f"validate_sources.py failed: {output}"
+            if invalid:
+                return f"invalid source URLs: {invalid}"
+        return None
+
+    def _research(self, company: str) -> dict:
+        self.pipeline.ws = self._workspace(company)
+        try:
+            result = self.pipeline(company_name=company)
+        finally:
+            self.pipeline.ws = None
+        return {
+            "company_facts": result.company_facts.model_dump(),
+            "analyst_summary": result.analyst_summary.model_dump(),
+            "review": result.review.model_dump(),
+            "review_stale": False,
+        }
+
+    def _update_summary(
+        self, company: str, previous: dict, facts: CompanyFacts, added: dict
+    ) -> dict:
+        with run_scope(RunBudget(self.pipeline.priority)):
+            summary = self.updater(
+                previous_summary=AnalystSummary(**previous["analyst_summary"]),
+                new_items=[item for items in added.values() for item in items],
+                company_facts=facts,
+            ).analyst_summary
+
+        ws = self._workspace(company)
+        ws.dump("01_company_facts", facts.model_dump())
+        ws.dump("02_summary", summary.model_dump())
+        return {
+            "company_facts": facts.model_dump(),
+            "analyst_summary": summary.model_dump(),
+            # The judge did not see the updated summary.
+            "review": previous.get("review"),
+            "review_stale": True,
+        }
+
+    def report(self) -> dict:
+        return {path: self.counts[path] for path in PATHS}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m dspy_impl.refresh",
+        description="Incrementally refresh research for a watchlist.",
+    )
+    parser.add_argument(
+        "companies",
+        nargs="*",
+        default=[name.title() for name in MOCK_DATA],
+        help="Watchlist (default: the mock companies)",
+    )
+    parser.add_argument("--workspace-dir", default="./workspace")
+    add_scheduler_args(parser)
+    add_memory_args(parser)
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write one Chrome/Perfetto trace of the whole batch",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    configure_lm()
+    configure_scheduler(rpm=args.rpm, tpm=args.tpm)
+    memory = configure_memory_from_args(args)
+
+    store = RefreshStore(args.workspace_dir)
+    # Batch work: interactive runs sharing the rate limits go first.
+    pipeline = CompanyResearchPipeline(
+        memory=memory,
+        priority=Priority.BATCH,
+        token_budget=args.token_budget,
+        time_budget_s=args.time_budget,
+    )
+    refresher = IncrementalRefresher(pipeline, store)
+    tracer = Tracer() if args.trace else None
+    failed: list[str] = []
+    try:
+        with trace_scope(tracer) if tracer else nullcontext():
+            for company in args.companies:
+                try:
+                    if memory:
+                        memory.check()
+                    refresher.refresh(company)
+                except MemoryError as e:
+                    # Refreshed companies are saved; rerun to pick up the rest.
+                    logger.error(f"{e}; stopping before {company}")
+                    break
+                except Exception:
+                    # Its previous state is kept; the next refresh retries it.
+                    logger.exception(f"❌ {company}: refresh failed")
+                    failed.append(company)
+    finally:
+        if tracer:
+            path = tracer.save(store.state_dir / "refresh_trace.json")
+            logger.info(f"🧵 Trace: {path}")
+
+        report = refresher.report()
+        logger.info(f"\n{'─' * 60}")
+        logger.info("REFRESH REPORT")
+        logger.info(f"{'─' * 60}")
+        logger.info(f"Unchanged (cached):  {report['unchanged']}")
+        logger.info(f"Writer only (delta): {report['writer_only']}")
+        logger.info(f"Full pipeline:       {report['full']}")
+        logger.info(f"Failed:              {len(failed)}")
+        store.save_report({"companies": args.companies, **report, "failed": failed})
+
+
+if __name__ == "__main__":
+    main()
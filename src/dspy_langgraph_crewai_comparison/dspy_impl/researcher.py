@@ -0,0 +1,86 @@
+"""ReAct researcher with a per-run budget and per-iteration trace spans.
+
+- Once the current run's budget (common/scheduler.py) is spent, the
+  researcher's tools stop running and tell it to call `finish`, so ReAct
+  goes to extraction with the trajectory gathered so far instead of
+  searching until max_iters
+- When tracing, each iteration (the step's LM call plus the tool it
+  picked) is recorded as a `react.iteration` span: TracingCallback calls
+  mark_iteration() whenever a module starts, and ReAct's step predictor
+  opens the next iteration while its extract module closes the last one
+"""
+
+import functools
+from collections.abc import Callable
+from contextvars import ContextVar
+
+import dspy
+from dspy.adapters.types.tool import Tool
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.common.scheduler import current_run
+from dspy_langgraph_crewai_comparison.common.tracing import current_tracer
+
+_iteration: ContextVar[dict | None] = ContextVar("react_iteration", default=None)
+
+
+def _budgeted(tool: Callable | Tool) -> Tool:
+    """The tool, refusing to run once the current run's budget is spent."""
+    tool = tool if isinstance(tool, Tool) else Tool(tool)
+    func = tool.func
+
+    @functools.wraps(func)
+    def call(**kwargs):
+        run = current_run()
+        if run and (reason := run.exhausted()):
+            logger.warning(f"💸 Researcher stopping early: {reason}")
+            return (
+                f"Not run: {reason}. Call finish now; your answer will be "
+                "extracted from what you have gathered so far."
+            )
+        return func(**kwargs)
+
+    tool.func = call
+    return tool
+
+
+def mark_iteration(module):
+    """Close the open iteration span on ReAct's step or extract call,
+    opening the next one on a step."""
+    state = _iteration.get()
+    tracer = current_tracer()
+    if state is None or tracer is None:
+        return
+    if module is state["react"]:
+        _close_iteration(state, tracer, start_next=True)
+    elif module is state["extract"]:
+        _close_iteration(state, tracer, start_next=False)
+
+
+def _close_iteration(state: dict, tracer, start_next: bool):
+    if state["start"] is not None:
+        tracer.complete(
+            "react.iteration",
+            "react",
+            state["start"],
+            {"iteration": state["index"]},
+        )
+        state["index"] += 1
+    state["start"] = tracer.now_us() if start_next else None
+
+
+class ResearcherReAct(dspy.ReAct):
+    def __init__(self, signature, tools: list[Callable | Tool], max_iters: int = 20):
+        super().__init__(signature, [_budgeted(t) for t in tools], max_iters)
+
+    def forward(self, **input_args):
+        # This copy's modules: GEPA runs several copies of the program.
+        token = _iteration.set(
+            {"react": self.react, "extract": self.extract, "index": 0, "start": None}
+        )
+        try:
+            return super().forward(**input_args)
+        finally:
+            if tracer := current_tracer():
+                _close_iteration(_iteration.get(), tracer, start_next=False)
+            _iteration.reset(token)
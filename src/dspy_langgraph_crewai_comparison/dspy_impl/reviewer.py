@@ -0,0 +1,115 @@
+"""Parallel reviewer: extract claims, verify each one concurrently, and
+assemble the ReviewResult locally.
+
+Drop-in replacement for dspy.ChainOfThought(ReviewSummary): same inputs,
+returns a Prediction with `review`. Wall time is roughly one extraction
+call plus one verification call, instead of one long generation whose
+length grows with the number of claims. A claim whose verification fails
+to parse is counted as unsupported rather than discarding the review.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import dspy
+from dspy.utils.exceptions import AdapterParseError
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.common.models import (
+    AnalystSummary,
+    ClaimVerification,
+    CompanyFacts,
+    ReviewResult,
+)
+from dspy_langgraph_crewai_comparison.dspy_impl.signature import (
+    ExtractClaims,
+    RateSummary,
+    VerifyClaim,
+)
+
+EXPECTED_FACETS = ["news", "financials", "risks", "outlook", "events"]
+APPROVAL_THRESHOLD = 0.8
+
+
+class ParallelReviewer(dspy.Module):
+    """Claim extraction → concurrent per-claim verification → local scoring."""
+
+    def __init__(self, max_parallel: int = 4):
+        self.max_parallel = max_parallel
+        self.extract = dspy.Predict(ExtractClaims)
+        self.verify = dspy.Predict(VerifyClaim)
+        self.rate = dspy.ChainOfThought(RateSummary)
+
+    def _verify(self, claim: str, company_facts: CompanyFacts) -> ClaimVerification:
+        try:
+            return self.verify(claim=claim, company_facts=company_facts).verification
+        except AdapterParseError as e:
+            logger.warning(f"Claim verification failed to parse: {claim[:60]}...")
+            return ClaimVerification(
+                claim=claim,
+                source_url="",
+                supported=False,
+                reasoning=f"Verification failed: {str(e).strip().splitlines()[0]}",
+            )
+
+    def forward(self, analyst_summary: AnalystSummary, company_facts: CompanyFacts):
+        claims = self.extract(analyst_summary=analyst_summary).claims
+
+        # Worker threads don't inherit dspy.context() overrides (e.g. the
+        # routed LM), so each task runs in a copy of the caller's context.
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            rating = pool.submit(
+                contextvars.copy_context().run,
+                self.rate,
+                analyst_summary=analyst_summary,
+            )
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run, self._verify, claim, company_facts
+                )
+                for claim in claims
+            ]
+            verifications = [f.result() for f in futures]
+            rating = rating.result()
+
+        return dspy.Prediction(
+            review=assemble_review(
+                verifications,
+                covered_facets=rating.covered_facets,
+                conciseness_rating=rating.conciseness_rating,
+                feedback=rating.feedback,
+            )
+        )
+
+
+def assemble_review(
+    verifications: list[ClaimVerification],
+    covered_facets: list[str],
+    conciseness_rating: int,
+    feedback: str,
+) -> ReviewResult:
+    """Compute ratios, issues and approval in code from the small calls."""
+    supported = sum(1 for v in verifications if v.supported)
+    accuracy = supported / len(verifications) if verifications else 0.0
+
+    normalized = {facet.strip().lower() for facet in covered_facets}
+    covered = [f for f in EXPECTED_FACETS if f in normalized]
+    missing = [f for f in EXPECTED_FACETS if f not in normalized]
+    completeness = len(covered) / len(EXPECTED_FACETS)
+
+    issues = [f"Unsupported claim: {v.claim}" for v in verifications if not v.supported]
+    issues += [f"Missing facet: {facet}" for facet in missing]
+    if not verifications:
+        issues.append("No verifiable claims found in summary")
+
+    return ReviewResult(
+        claim_verifications=verifications,
+        accuracy_ratio=accuracy,
+        expected_facets=EXPECTED_FACETS,
+        covered_facets=covered,
+        completeness_ratio=completeness,
+        conciseness_rating=min(max(conciseness_rating, 1), 5),
+        feedback=feedback,
+        issues=issues,
+        approved=accuracy >= APPROVAL_THRESHOLD and completeness >= APPROVAL_THRESHOLD,
+    )
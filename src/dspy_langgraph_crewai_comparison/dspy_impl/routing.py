@@ -0,0 +1,225 @@
+"""Per-stage LM routing with an optional escalation cascade.
+
+Each pipeline stage (researcher, writer, reviewer) can run on its own LM.
+With a fallback configured, the stage first runs on the fast model and is
+re-run on the strong one only when the output fails to parse or the
+stage's check rejects it (structural_check for the researcher, the judge
+for the writer).
+
+The time saved is estimated against LatencyBaselines: strong-model
+latencies per stage, kept across runs (and across processes when given a
+path), with configurable defaults for stages not measured yet.
+"""
+
+import contextvars
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import dspy
+from dspy.utils.exceptions import AdapterParseError
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.common.tracing import span
+
+STAGES = ("researcher", "writer", "reviewer")
+
+
+@dataclass
+class StageRoute:
+    """LM for one stage; None means the globally configured dspy LM."""
+
+    lm: dspy.LM | None = None
+    fallback: dspy.LM | None = None
+
+
+def _model_name(lm: dspy.LM | None) -> str:
+    lm = lm or dspy.settings.lm
+    return lm.model if lm else "unconfigured"
+
+
+class LatencyBaselines:
+    """Strong-model latency per stage, the baseline for latency_saved_s.
+
+    Samples are the strong-model calls the cascade makes anyway (escalations
+    and the strong judge), kept in a rolling window. With a `path` they are
+    saved after each sample and loaded on start, so a run that doesn't
+    escalate still reports a saving. Escalations are the hard cases, so
+    their samples lean slow; `defaults` (seconds per stage, e.g. measured
+    with the strong model alone) are used until a stage has samples.
+
+    Thread-safe; share one instance between the pipelines of a process."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        defaults: dict[str, float] | None = None,
+        window: int = 100,
+    ):
+        self.path = Path(path) if path else None
+        self.defaults = defaults or {}
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+        if self.path and self.path.exists():
+            saved = json.loads(self.path.read_text(encoding="utf-8"))
+            for stage, samples in saved.items():
+                self._samples[stage] = deque(samples, maxlen=window)
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            samples = self._samples.setdefault(stage, deque(maxlen=self.window))
+            samples.append(round(seconds, 3))
+            if self.path:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.path.write_text(
+                    json.dumps({k: list(v) for k, v in self._samples.items()}),
+                    encoding="utf-8",
+                )
+
+    def mean(self, stage: str) -> float | None:
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples:
+                return sum(samples) / len(samples)
+        return self.defaults.get(stage)
+
+
+class StageRouter:
+    """Runs stages on their routed LM and records escalations.
+
+    Strong-model latencies go to `baselines` so that each run can estimate
+    the time saved by serving stages on the fast model. Per-run events live
+    in a context variable so concurrent runs don't mix."""
+
+    def __init__(
+        self,
+        routes: dict[str, StageRoute] | None = None,
+        baselines: LatencyBaselines | None = None,
+    ):
+        self.routes = routes or {}
+        self.baselines = baselines or LatencyBaselines()
+        self._events: contextvars.ContextVar[list[dict] | None] = (
+            contextvars.ContextVar(f"stage_events_{id(self)}", default=None)
+        )
+
+    def __deepcopy__(self, memo):
+        # Shared by program copies, like SkillLoader.
+        return self
+
+    @property
+    def events(self) -> list[dict]:
+        events = self._events.get()
+        if events is None:
+            events = []
+            self._events.set(events)
+        return events
+
+    def route(self, stage: str) -> StageRoute:
+        return self.routes.get(stage) or StageRoute()
+
+    def can_escalate(self, stage: str) -> bool:
+        return self.route(stage).fallback is not None
+
+    def start_run(self):
+        self._events.set([])
+
+    def _run(self, stage: str, module, lm, tier: str, reason: str | None, kwargs):
+        t0 = time.perf_counter()
+        try:
+            with (
+                span(stage, cat="stage", tier=tier, model=_model_name(lm)),
+                dspy.context(lm=lm) if lm else nullcontext(),
+            ):
+                return module(**kwargs)
+        finally:
+            seconds = time.perf_counter() - t0
+            if tier == "strong":
+                self.baselines.record(stage, seconds)
+            self.events.append(
+                {
+                    "stage": stage,
+                    "tier": tier,
+                    "model": _model_name(lm),
+                    "seconds": round(seconds, 3),
+                    "reason": reason,
+                }
+            )
+
+    def call(
+        self,
+        stage: str,
+        module,
+        check: Callable[[dspy.Prediction], str | None] | None = None,
+        on_escalate: Callable[[], None] | None = None,
+        **kwargs,
+    ) -> dspy.Prediction:
+        """Run a stage, escalating to its fallback LM if the output fails
+        to parse or check(result) returns a reason. on_escalate() runs
+        before the retry (e.g. to discard state from the fast attempt)."""
+        route = self.route(stage)
+        if route.fallback is None:
+            return self._run(stage, module, route.lm, "direct", None, kwargs)
+
+        try:
+            result = self._run(stage, module, route.lm, "fast", None, kwargs)
+            reason = check(result) if check else None
+        except AdapterParseError as e:
+            reason = f"parse error: {str(e).strip().splitlines()[0]}"
+        if reason is None:
+            return result
+        if on_escalate:
+            on_escalate()
+        return self.escalate(stage, module, reason, **kwargs)
+
+    def call_strong(self, stage: str, module, **kwargs) -> dspy.Prediction:
+        """Run a stage on its fallback (strong) LM when it has one, without
+        counting an escalation (e.g. a judge that gates another stage)."""
+        route = self.route(stage)
+        if route.fallback is None:
+            return self.call(stage, module, **kwargs)
+        return self._run(stage, module, route.fallback, "strong", None, kwargs)
+
+    def escalate(self, stage: str, module, reason: str, **kwargs) -> dspy.Prediction:
+        """Re-run a stage on its fallback LM."""
+        route = self.route(stage)
+        logger.info(f"⤴️  Escalating {stage} to {_model_name(route.fallback)}: {reason}")
+        return self._run(stage, module, route.fallback, "strong", reason, kwargs)
+
+    def run_summary(self) -> dict:
+        """Per-stage models, escalations and estimated latency saved.
+
+        latency_saved_s compares each cascaded stage against its strong-model
+        baseline (LatencyBaselines); it is None for a stage without one (and
+        the total is None while no stage has a baseline)."""
+        stages: dict[str, dict] = {}
+        for event in self.events:
+            stage = stages.setdefault(
+                event["stage"],
+                {"calls": [], "escalations": 0, "seconds": 0.0},
+            )
+            stage["calls"].append(event)
+            stage["seconds"] = round(stage["seconds"] + event["seconds"], 3)
+            if event["reason"] is not None:
+                stage["escalations"] += 1
+
+        saved_total = None
+        for name, stage in stages.items():
+            stage["latency_saved_s"] = None
+            fast_calls = sum(1 for e in stage["calls"] if e["tier"] == "fast")
+            strong = self.baselines.mean(name)
+            if fast_calls and strong:
+                baseline = fast_calls * strong
+                stage["latency_saved_s"] = round(baseline - stage["seconds"], 3)
+                saved_total = (saved_total or 0.0) + stage["latency_saved_s"]
+
+        return {
+            "stages": stages,
+            "escalations": sum(s["escalations"] for s in stages.values()),
+            "latency_saved_s": None if saved_total is None else round(saved_total, 3),
+        }
@@ -4,44 +4,313 @@ Usage:
     python -m dspy_impl.run                    # defaults to Apple
     python -m dspy_impl.run "Tesla"
     python -m dspy_impl.run "Nvidia"
-"""
 
-import sys
-import dspy
-from loguru import logger
+dspy/litellm are imported lazily, so `--help` and a missing API key fail
+fast without paying several seconds of import time.
+"""
 
-from dspy_langgraph_crewai_comparison.common.workspace import Workspace
-from dspy_langgraph_crewai_comparison.dspy_impl.pipeline import CompanyResearchPipeline
+import argparse
+import json
+import os
+from pathlib import Path
 
+from loguru import logger
 
-def configure_lm(cache: bool = True):
-    import os
 
+def provider_settings() -> tuple[str, str, str, dict]:
+    """(label, strong model, fast model, LM kwargs) for the configured provider."""
     if os.getenv("ANTHROPIC_API_KEY"):
-        lm = dspy.LM("anthropic/claude-sonnet-4-20250514", cache=cache, max_tokens=4096)
-        logger.info("Using: Claude Sonnet 4")
+        return (
+            "Claude Sonnet 4",
+            "anthropic/claude-sonnet-4-20250514",
+            "anthropic/claude-3-5-haiku-20241022",
+            {"max_tokens": 4096},
+        )
     elif os.getenv("OPENAI_API_KEY"):
-        lm = dspy.LM("openai/gpt-4o", cache=cache, max_tokens=4096)
-        logger.info("Using: GPT-4o")
+        return "GPT-4o", "openai/gpt-4o", "openai/gpt-4o-mini", {"max_tokens": 4096}
     elif os.getenv("VERTEX_PROJECT_ID"):
-        lm = dspy.LM(
-            model="vertex_ai/gemini-2.5-pro",
-            cache=cache,
-            max_tokens=None,
-            vertex_ai_location=os.getenv("VERTEX_LOCATION", ""),
-            project=os.getenv("VERTEX_PROJECT_ID", ""),
+        return (
+            "Vertex AI Gemini",
+            "vertex_ai/gemini-2.5-pro",
+            "vertex_ai/gemini-2.5-flash",
+            {
+                "max_tokens": None,
+                "vertex_ai_location": os.getenv("VERTEX_LOCATION", ""),
+                "project": os.getenv("VERTEX_PROJECT_ID", ""),
+            },
         )
-        logger.info("Using: Vertex AI Gemini")
+    raise EnvironmentError(
+        "Set ANTHROPIC_API_KEY, OPENAI_API_KEY, or VERTEX_PROJECT_ID."
+    )
+
+
+def make_lm(model: str, cache: bool = True):
+    """Build a dspy.LM, reusing the provider kwargs when the model is on the
+    configured provider."""
+    import dspy
+
+    _, strong, _, kwargs = provider_settings()
+    if model.split("/")[0] != strong.split("/")[0]:
+        kwargs = {"max_tokens": 4096}
+    return dspy.LM(model, cache=cache, **kwargs)
+
+
+def configure_lm(cache: bool = True):
+    label, strong, _, _ = provider_settings()
+
+    import dspy
+
+    lm = make_lm(strong, cache=cache)
+    logger.info(f"Using: {label}")
+    dspy.configure(lm=lm)
+    return lm
+
+
+def configure_memory(
+    history_size: int = 100,
+    rss_limit_mb: float | None = None,
+    trace_allocations: bool = False,
+    bound_trace: bool = True,
+):
+    """Bound dspy's in-process state for long-running batch/server use.
+
+    history_size caps the per-LM and per-module call history and, unless
+    bound_trace is False, the predictor trace (0 disables both). Optimizers
+    need whole program traces, so optimize.py leaves the trace at dspy's
+    default. dspy's global history has a fixed cap of its own, so it is
+    trimmed to the same size after every run. The in-memory response cache is bounded too; the disk cache is
+    unaffected. Returns the MemoryGuard to pass to the pipeline."""
+    import dspy
+    from dspy.clients import base_lm
+
+    from dspy_langgraph_crewai_comparison.common.memory import MemoryGuard
+
+    if history_size == 0:
+        dspy.configure(disable_history=True)
     else:
-        raise EnvironmentError(
-            "Set ANTHROPIC_API_KEY, OPENAI_API_KEY, or VERTEX_PROJECT_ID."
+        dspy.configure(max_history_size=history_size)
+    if bound_trace:
+        dspy.configure(max_trace_size=history_size)
+    dspy.configure_cache(memory_max_entries=max(10 * history_size, 100))
+
+    def trim_global_history():
+        excess = len(base_lm.GLOBAL_HISTORY) - history_size
+        if excess > 0:
+            del base_lm.GLOBAL_HISTORY[:excess]
+
+    guard = MemoryGuard(rss_limit_mb=rss_limit_mb, trace_allocations=trace_allocations)
+    guard.add_release_hook(trim_global_history)
+    logger.info(
+        f"Bounded memory: history={history_size}, "
+        f"RSS ceiling={f'{rss_limit_mb:.0f} MB' if rss_limit_mb else 'none'}"
+    )
+    return guard
+
+
+def configure_scheduler(rpm: float | None = None, tpm: float | None = None):
+    """Install the process-wide rate limiter on every dspy LM call.
+
+    rpm/tpm (or LM_RPM/LM_TPM) apply to each model without a specific
+    limit. LM_RATE_LIMITS sets limits per model or provider, e.g.
+    '{"anthropic": {"rpm": 50, "tpm": 40000}, "openai/gpt-4o": {"rpm": 500}}';
+    a provider limit is shared by all of its models. Without any limit,
+    calls are never delayed but still count against run budgets."""
+    import dspy
+
+    from dspy_langgraph_crewai_comparison.common.scheduler import (
+        RateLimit,
+        RateLimitScheduler,
+    )
+    from dspy_langgraph_crewai_comparison.dspy_impl.scheduling import (
+        RateLimitCallback,
+    )
+
+    rpm = rpm or float(os.getenv("LM_RPM") or 0) or None
+    tpm = tpm or float(os.getenv("LM_TPM") or 0) or None
+    limits = {
+        key: RateLimit(**limit)
+        for key, limit in json.loads(os.getenv("LM_RATE_LIMITS", "{}")).items()
+    }
+    scheduler = RateLimitScheduler(limits, default=RateLimit(rpm=rpm, tpm=tpm))
+    callbacks = [
+        cb for cb in dspy.settings.callbacks if not isinstance(cb, RateLimitCallback)
+    ]
+    dspy.configure(callbacks=[*callbacks, RateLimitCallback(scheduler)])
+    for key, limit in {"*": scheduler.default, **limits}.items():
+        if limit.rpm or limit.tpm:
+            logger.info(f"Rate limit {key}: rpm={limit.rpm} tpm={limit.tpm}")
+    return scheduler
+
+
+def add_scheduler_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--rpm", type=float, help="Requests/min per model")
+    parser.add_argument("--tpm", type=float, help="Tokens/min per model")
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        help="Per-run token budget; the researcher stops early once spent",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="Per-run wall-clock budget in seconds",
+    )
+
+
+def add_memory_args(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--history-size",
+        type=int,
+        help="Bounded memory: cap LM history/trace at N entries (0 disables)",
+    )
+    parser.add_argument(
+        "--rss-limit-mb",
+        "--max-rss-mb",
+        type=float,
+        help="Bounded memory: start no new run once RSS exceeds this ceiling",
+    )
+    parser.add_argument(
+        "--trace-allocations",
+        action="store_true",
+        help="Report top allocators per stage with tracemalloc (slow)",
+    )
+
+
+def configure_memory_from_args(args: argparse.Namespace, **kwargs):
+    """configure_memory() if any add_memory_args flag is set, else None."""
+    if (
+        args.history_size is None
+        and args.rss_limit_mb is None
+        and not args.trace_allocations
+    ):
+        return None
+    return configure_memory(
+        history_size=100 if args.history_size is None else args.history_size,
+        rss_limit_mb=args.rss_limit_mb,
+        trace_allocations=args.trace_allocations,
+        **kwargs,
+    )
+
+
+def configure_mcp():
+    """Pooled MCP sessions for the researcher's tools, or None if no MCP
+    server is configured.
+
+    MCP_SEARCH_COMMAND (e.g. "npx -y some-search-mcp") replaces the mock
+    web_search; MCP_PYTHON_COMMAND (e.g. "uvx mcp-python-repl") adds a
+    run_python tool. MCP_SEARCH_TOOL / MCP_PYTHON_TOOL name the tool to
+    call on each server. Each keeps up to MCP_POOL_SIZE sessions (default
+    2); a run gets a REPL session of its own, discarded when it ends."""
+    from dspy_langgraph_crewai_comparison.common.mcp_client import (
+        MCPClientPool,
+        MCPServerConfig,
+    )
+
+    servers = []
+    if command := os.getenv("MCP_SEARCH_COMMAND"):
+        servers.append(
+            MCPServerConfig.from_command_line(
+                "search",
+                command,
+                tool=os.getenv("MCP_SEARCH_TOOL", "search"),
+                pool_size=int(os.getenv("MCP_POOL_SIZE") or 2),
+            )
         )
+    if command := os.getenv("MCP_PYTHON_COMMAND"):
+        servers.append(
+            MCPServerConfig.from_command_line(
+                "python",
+                command,
+                tool=os.getenv("MCP_PYTHON_TOOL", "run_python"),
+                pool_size=int(os.getenv("MCP_POOL_SIZE") or 2),
+            )
+        )
+    if not servers:
+        return None
+    for server in servers:
+        logger.info(
+            f"MCP {server.name}: {server.command} {' '.join(server.args)} "
+            f"({server.pool_size} sessions)"
+        )
+    return MCPClientPool(servers)
 
-    dspy.configure(lm=lm)
+
+def configure_routes(cascade: bool = False, cache: bool = True) -> dict:
+    """Per-stage LM routes for CompanyResearchPipeline.
+
+    <STAGE>_MODEL (e.g. WRITER_MODEL=openai/gpt-4o-mini) pins a stage to a
+    model. With cascade, every stage starts on its pinned model or the
+    provider's fast model and escalates to the strong (default) model."""
+    from dspy_langgraph_crewai_comparison.dspy_impl.routing import (
+        STAGES,
+        StageRoute,
+    )
+
+    _, strong, fast, _ = provider_settings()
+    strong_lm = make_lm(strong, cache=cache) if cascade else None
+    routes = {}
+    for stage in STAGES:
+        model = os.getenv(f"{stage.upper()}_MODEL")
+        if cascade:
+            routes[stage] = StageRoute(
+                lm=make_lm(model or fast, cache=cache), fallback=strong_lm
+            )
+        elif model:
+            routes[stage] = StageRoute(lm=make_lm(model, cache=cache))
+        else:
+            continue
+        logger.info(
+            f"Route {stage}: {routes[stage].lm.model}"
+            + (f" → {strong}" if cascade else "")
+        )
+    return routes
 
 
-def main():
-    company = sys.argv[1] if len(sys.argv) > 1 else "Apple"
+def configure_baselines(workspace_dir: str = "./workspace"):
+    """Strong-model latency baselines for the cascade's latency_saved_s,
+    persisted in the workspace so every run (and process) adds to them.
+
+    LATENCY_BASELINES seeds stages that haven't been measured yet, e.g.
+    '{"researcher": 20, "writer": 6, "reviewer": 4}' (seconds)."""
+    from dspy_langgraph_crewai_comparison.dspy_impl.routing import LatencyBaselines
+
+    return LatencyBaselines(
+        Path(workspace_dir) / "routing_baselines.json",
+        defaults=json.loads(os.getenv("LATENCY_BASELINES") or "{}"),
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m dspy_impl.run",
+        description="Run the DSPy Company Research Pipeline.",
+    )
+    parser.add_argument(
+        "company", nargs="?", default="Apple", help="Company to research"
+    )
+    parser.add_argument(
+        "--cascade",
+        action="store_true",
+        help="Run stages on a fast model, escalate to the strong one on failure",
+    )
+    parser.add_argument(
+        "--parallel-review",
+        action="store_true",
+        help="Verify claims concurrently instead of one long review call",
+    )
+    add_scheduler_args(parser)
+    add_memory_args(parser)
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a Chrome/Perfetto trace.json into the run's workspace",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    company = args.company
 
     logger.info(f"\n{'=' * 60}")
     logger.info("  Company Research Pipeline (DSPy)")
@@ -49,11 +318,35 @@ def main():
     logger.info(f"{'=' * 60}\n")
 
     configure_lm()
+    configure_scheduler(rpm=args.rpm, tpm=args.tpm)
+    routes = configure_routes(cascade=args.cascade)
+    memory = configure_memory_from_args(args)
+    mcp = configure_mcp()
+
+    from dspy_langgraph_crewai_comparison.common.workspace import Workspace
+    from dspy_langgraph_crewai_comparison.dspy_impl.pipeline import (
+        CompanyResearchPipeline,
+    )
+
     ws = Workspace()
-    pipeline = CompanyResearchPipeline(workspace=ws)
+    pipeline = CompanyResearchPipeline(
+        workspace=ws,
+        routes=routes,
+        baselines=configure_baselines() if args.cascade else None,
+        parallel_review=args.parallel_review,
+        memory=memory,
+        token_budget=args.token_budget,
+        time_budget_s=args.time_budget,
+        trace=args.trace,
+        mcp=mcp,
+    )
 
     logger.info(f"Researching {company}...")
-    result = pipeline(company_name=company)
+    try:
+        result = pipeline(company_name=company)
+    finally:
+        if mcp:
+            mcp.close()
 
     facts = result.company_facts
     summary = result.analyst_summary
@@ -115,6 +408,31 @@ def main():
     logger.info(f"Tool coverage:       {scores['tool_coverage']:.0%}")
     logger.info(f"Overall:             {scores['overall']:.0%}")
 
+    routing = result.routing
+    if routing["stages"]:
+        logger.info(f"\n{'─' * 60}")
+        logger.info("ROUTING")
+        logger.info(f"{'─' * 60}")
+        for stage, info in routing["stages"].items():
+            models = " → ".join(call["model"] for call in info["calls"])
+            logger.info(f"{stage + ':':<20} {models} ({info['seconds']:.1f}s)")
+        logger.info(f"Escalations:         {routing['escalations']}")
+        saved = routing["latency_saved_s"]
+        logger.info(
+            f"Latency saved:       {'n/a' if saved is None else f'{saved:.1f}s'}"
+        )
+
+    scheduling = result.scheduling
+    logger.info(f"\n{'─' * 60}")
+    logger.info("SCHEDULING")
+    logger.info(f"{'─' * 60}")
+    logger.info(f"LM calls:            {scheduling['lm_calls']}")
+    logger.info(f"Tokens (est.):       {scheduling['tokens_est']}")
+    logger.info(f"Queueing delay:      {scheduling['queue_seconds']:.1f}s")
+    logger.info(f"Wall clock:          {scheduling['elapsed_seconds']:.1f}s")
+    if scheduling["budget_exhausted"]:
+        logger.info(f"Budget:              {scheduling['budget_exhausted']}")
+
     logger.info(f"\n{'=' * 60}")
     logger.info("Done.")
 
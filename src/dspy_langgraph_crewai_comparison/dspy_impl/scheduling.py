@@ -0,0 +1,111 @@
+"""Hooks the process-wide RateLimitScheduler into dspy LM calls.
+
+RateLimitCallback runs on every dspy.LM call: it blocks until the
+model's request/token buckets allow the call (highest priority first),
+then charges the estimated prompt and completion tokens, plus the time
+spent queueing, to the current run's budget. ResearcherReAct
+(researcher.py) stops the researcher early once that budget is spent.
+
+Calls dspy answers from its response cache never reach the provider, but
+that is only known once the call returns: dspy reports provider usage for
+every call except cache hits. Each call gets its own usage tracker, and a
+call that reported none is refunded — its request and prompt tokens go
+back to the buckets and nothing is charged to the run.
+"""
+
+import json
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+
+import dspy
+from dspy.utils.callback import BaseCallback
+from dspy.utils.usage_tracker import UsageTracker
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.common.scheduler import (
+    Priority,
+    RateLimitScheduler,
+    current_run,
+)
+from dspy_langgraph_crewai_comparison.common.tracing import span
+
+
+def estimate_tokens(payload) -> int:
+    """Rough token count (~4 characters per token) of a prompt or completion."""
+    if payload is None:
+        return 0
+    if not isinstance(payload, str):
+        payload = json.dumps(payload, default=str)
+    return max(1, len(payload) // 4)
+
+
+class _CallUsage(UsageTracker):
+    """Usage tracker for a single LM call: records whether dspy reported
+    provider usage, and forwards it to the enclosing tracker, if any."""
+
+    def __init__(self, outer: UsageTracker | None):
+        super().__init__()
+        self.outer = outer
+        self.reported = False
+
+    def add_usage(self, lm: str, usage_entry: dict):
+        self.reported = True
+        if self.outer is not None:
+            self.outer.add_usage(lm, usage_entry)
+
+
+@dataclass
+class _PendingCall:
+    model: str
+    prompt_tokens: int
+    usage: _CallUsage
+    scope: AbstractContextManager
+
+
+class RateLimitCallback(BaseCallback):
+    def __init__(self, scheduler: RateLimitScheduler):
+        self.scheduler = scheduler
+        self._pending: dict[str, _PendingCall] = {}
+
+    def on_lm_start(self, call_id, instance, inputs):
+        run = current_run()
+        prompt_tokens = estimate_tokens(inputs.get("messages") or inputs.get("prompt"))
+        priority = run.priority if run else Priority.BATCH
+        with span(
+            "rate_limit.wait",
+            cat="scheduler",
+            model=instance.model,
+            priority=priority.name.lower(),
+        ):
+            delay = self.scheduler.acquire(instance.model, prompt_tokens, priority)
+        if delay > 0.05:
+            logger.debug(f"⏳ {instance.model}: queued {delay:.2f}s ({priority.name})")
+        if run:
+            run.charge(tokens=prompt_tokens, queue_seconds=delay, calls=1)
+
+        # Exited in on_lm_end, which runs in the same context after the call.
+        usage = _CallUsage(dspy.settings.usage_tracker)
+        scope = dspy.context(usage_tracker=usage)
+        scope.__enter__()
+        self._pending[call_id] = _PendingCall(
+            instance.model, prompt_tokens, usage, scope
+        )
+
+    def on_lm_end(self, call_id, outputs, exception=None):
+        call = self._pending.pop(call_id, None)
+        if call is None:
+            return
+        call.scope.__exit__(None, None, None)
+        run = current_run()
+        if exception is None and not call.usage.reported:
+            # Served from dspy's cache: the provider never saw it.
+            self.scheduler.refund(call.model, call.prompt_tokens)
+            if run:
+                run.charge(tokens=-call.prompt_tokens, calls=-1)
+            return
+        if outputs is None:
+            return
+        completion_tokens = estimate_tokens(outputs)
+        self.scheduler.debit(call.model, completion_tokens)
+        if run:
+            run.charge(tokens=completion_tokens)
@@ -0,0 +1,305 @@
+"""Long-lived HTTP server for the DSPy Company Research Pipeline.
+
+Imports dspy, configures the LM and builds the pipelines once, so each
+request only pays for its LM calls.
+
+Usage:
+    python -m dspy_impl.server                     # 127.0.0.1:8000, 4 workers
+    python -m dspy_impl.server --port 9000 --workers 8
+
+Endpoints:
+    GET  /health    → {"status": "ok", "workers": 4, "busy": 1, "served": 12}
+    POST /research  → body {"company": "Apple"}, returns the final output JSON
+"""
+
+import argparse
+import json
+import queue
+import signal
+import threading
+import uuid
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from loguru import logger
+
+from dspy_langgraph_crewai_comparison.dspy_impl.run import (
+    add_memory_args,
+    add_scheduler_args,
+    configure_lm,
+    configure_baselines,
+    configure_mcp,
+    configure_memory_from_args,
+    configure_routes,
+    configure_scheduler,
+)
+
+
+class PipelinePool:
+    """Fixed set of warm pipelines, one per concurrent request.
+
+    A pipeline owns a workspace, so it is never shared between two
+    in-flight requests; callers wait for a free one instead."""
+
+    def __init__(
+        self,
+        workers: int,
+        workspace_dir: str = "./workspace",
+        routes: dict | None = None,
+        baselines=None,
+        parallel_review: bool = False,
+        memory=None,
+        token_budget: int | None = None,
+        time_budget_s: float | None = None,
+        trace: bool = False,
+        mcp=None,
+    ):
+        from dspy_langgraph_crewai_comparison.dspy_impl.pipeline import (
+            CompanyResearchPipeline,
+        )
+
+        self.workers = workers
+        self.memory = memory
+        self.workspace_dir = workspace_dir
+        self._idle: queue.Queue = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(
+                CompanyResearchPipeline(
+                    routes=routes,
+                    baselines=baselines,
+                    parallel_review=parallel_review,
+                    memory=memory,
+                    token_budget=token_budget,
+                    time_budget_s=time_budget_s,
+                    trace=trace,
+                    mcp=mcp,
+                )
+            )
+
+        self._lock = threading.Lock()
+        self.busy = 0
+        self.served = 0
+        self.failed = 0
+
+    def research(self, company: str) -> dict:
+        from dspy_langgraph_crewai_comparison.common.workspace import Workspace
+
+        pipeline = self._idle.get()
+        with self._lock:
+            self.busy += 1
+        try:
+            if self.memory:
+                self.memory.check()  # refuse before creating a workspace
+            run_id = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+            pipeline.ws = Workspace(self.workspace_dir, run_id=run_id)
+            result = pipeline(company_name=company)
+            output = {
+                "run_id": run_id,
+                "company_facts": result.company_facts.model_dump(),
+                "analyst_summary": result.analyst_summary.model_dump(),
+                "review": result.review.model_dump(),
+                "skill_tracker": result.skill_tracker,
+                "routing": result.routing,
+                "scheduling": result.scheduling,
+            }
+            with self._lock:
+                self.served += 1
+            return output
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            pipeline.ws = None
+            with self._lock:
+                self.busy -= 1
+            self._idle.put(pipeline)
+
+    def over_memory_limit(self) -> str | None:
+        """The RSS ceiling breach, if any (checked after a finished run)."""
+        if self.memory is None:
+            return None
+        try:
+            self.memory.check()
+        except MemoryError as e:
+            return str(e)
+        return None
+
+    def health(self) -> dict:
+        with self._lock:
+            health = {
+                "status": "ok",
+                "workers": self.workers,
+                "busy": self.busy,
+                "served": self.served,
+                "failed": self.failed,
+            }
+        if self.memory:
+            health["memory"] = self.memory.report()
+        return health
+
+
+class ResearchHandler(BaseHTTPRequestHandler):
+    server: "ResearchServer"
+
+    def _send_json(self, status: HTTPStatus, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            health = self.server.pool.health()
+            if self.server.draining:
+                health["status"] = "draining"
+            self._send_json(HTTPStatus.OK, health)
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"No route {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/research":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"No route {self.path}"})
+            return
+        if self.server.draining:
+            self._send_json(
+                HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Server is shutting down"}
+            )
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            company = request["company"].strip()
+            if not company:
+                raise ValueError("company is empty")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._send_json(
+                HTTPStatus.BAD_REQUEST,
+                {"error": f'Expected JSON body {{"company": "..."}}: {e}'},
+            )
+            return
+
+        logger.info(f"Researching {company}...")
+        try:
+            output = self.server.pool.research(company)
+        except MemoryError as e:
+            # Refused before starting: over the RSS ceiling. Finish in-flight
+            # work and exit so a supervisor can restart with a clean heap.
+            logger.error(f"{e}; shutting down")
+            self.server.shutdown_gracefully()
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)})
+            return
+        except Exception as e:
+            logger.exception(f"Research failed for {company}")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            return
+        self._send_json(HTTPStatus.OK, output)
+        # The run is done and delivered; only then drain if it pushed the
+        # process over the ceiling.
+        if breach := self.server.pool.over_memory_limit():
+            logger.error(f"{breach}; shutting down")
+            self.server.shutdown_gracefully()
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class ResearchServer(ThreadingHTTPServer):
+    # Non-daemon handler threads: server_close() waits for in-flight requests.
+    daemon_threads = False
+    block_on_close = True
+
+    def __init__(self, address: tuple[str, int], pool: PipelinePool):
+        super().__init__(address, ResearchHandler)
+        self.pool = pool
+        self.draining = False
+
+    def shutdown_gracefully(self):
+        """Stop accepting requests and let in-flight ones finish."""
+        self.draining = True
+        # shutdown() blocks until serve_forever() returns, so never call it
+        # from the serving thread itself.
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m dspy_impl.server",
+        description="Serve the DSPy Company Research Pipeline over HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Concurrent pipeline runs"
+    )
+    parser.add_argument("--workspace-dir", default="./workspace")
+    parser.add_argument(
+        "--cascade",
+        action="store_true",
+        help="Run stages on a fast model, escalate to the strong one on failure",
+    )
+    add_memory_args(parser)
+    parser.add_argument(
+        "--parallel-review",
+        action="store_true",
+        help="Verify claims concurrently instead of one long review call",
+    )
+    add_scheduler_args(parser)
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a Chrome/Perfetto trace.json into each request's workspace",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+
+    configure_lm()
+    configure_scheduler(rpm=args.rpm, tpm=args.tpm)
+    routes = configure_routes(cascade=args.cascade)
+    # One set of MCP sessions, shared by every worker pipeline.
+    mcp = configure_mcp()
+    if mcp:
+        mcp.warm_up()
+    # Over the RSS ceiling, the server drains and exits for a restart.
+    memory = configure_memory_from_args(args)
+    pool = PipelinePool(
+        args.workers,
+        workspace_dir=args.workspace_dir,
+        routes=routes,
+        # One set of latency baselines for all workers.
+        baselines=configure_baselines(args.workspace_dir) if args.cascade else None,
+        parallel_review=args.parallel_review,
+        memory=memory,
+        token_budget=args.token_budget,
+        time_budget_s=args.time_budget,
+        trace=args.trace,
+        mcp=mcp,
+    )
+    server = ResearchServer((args.host, args.port), pool)
+
+    def _stop(signum, frame):
+        logger.info(f"Received {signal.Signals(signum).name}, draining...")
+        server.shutdown_gracefully()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    logger.info(
+        f"🚀 Serving on http://{args.host}:{args.port} ({args.workers} workers)"
+    )
+    server.serve_forever()
+    server.server_close()
+    if mcp:
+        mcp.close()
+    logger.info("Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
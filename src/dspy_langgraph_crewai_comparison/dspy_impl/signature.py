@@ -3,6 +3,7 @@ import dspy
 from dspy_langgraph_crewai_comparison.common.models import (
     CompanyFacts,
     AnalystSummary,
+    ClaimVerification,
     ReviewResult,
 )
 
@@ -48,3 +49,56 @@ class ReviewSummary(dspy.Signature):
     review: ReviewResult = dspy.OutputField(
         desc="Detailed evaluation with claim verifications"
     )
+
+
+# — Parallel reviewer: small calls instead of one long ReviewSummary —
+
+
+class ExtractClaims(dspy.Signature):
+    """List every factual claim made in an analyst summary.
+    One claim per item, self-contained and checkable against a source.
+    Do not verify the claims."""
+
+    analyst_summary: AnalystSummary = dspy.InputField(desc="The summary to evaluate")
+    claims: list[str] = dspy.OutputField(desc="Factual claims, one per item")
+
+
+class VerifyClaim(dspy.Signature):
+    """Verify a single claim against the source facts.
+    Pick the source URL that should support it and decide whether the
+    facts actually support the claim."""
+
+    claim: str = dspy.InputField(desc="One factual claim from the summary")
+    company_facts: CompanyFacts = dspy.InputField(desc="Source facts to verify against")
+    verification: ClaimVerification = dspy.OutputField(
+        desc="Verdict for this claim with reasoning"
+    )
+
+
+class RateSummary(dspy.Signature):
+    """Check which facets an analyst summary covers and rate its conciseness.
+    Facets: news, financials, risks, outlook, events.
+    Conciseness 1-5: 1=verbose with filler, 5=every sentence adds value."""
+
+    analyst_summary: AnalystSummary = dspy.InputField(desc="The summary to evaluate")
+    covered_facets: list[str] = dspy.OutputField(
+        desc="Facets present in the summary, from: news, financials, risks, outlook, events"
+    )
+    conciseness_rating: int = dspy.OutputField(desc="1-5")
+    feedback: str = dspy.OutputField(desc="One or two sentences on how to improve")
+
+
+class UpdateAnalystSummary(dspy.Signature):
+    """Update an existing analyst summary with newly found items.
+    Keep what is still accurate, work the new items in, and stay under
+    200 words. Every claim must trace back to a source.
+    Revise key risks and the one-sentence outlook only if the new items warrant it."""
+
+    previous_summary: AnalystSummary = dspy.InputField(
+        desc="Summary from the last full research run"
+    )
+    new_items: list[str] = dspy.InputField(desc="Search results not seen last time")
+    company_facts: CompanyFacts = dspy.InputField(
+        desc="Facts with the new items merged in"
+    )
+    analyst_summary: AnalystSummary = dspy.OutputField(desc="Updated analyst summary")
@@ -0,0 +1,77 @@
+"""Records dspy LM and tool calls as spans in the active Tracer.
+
+trace_scope(tracer) activates the tracer and adds TracingCallback to the
+dspy callbacks for the block only, so nothing is recorded (or paid for)
+outside a traced run. Together with the spans emitted by the pipeline,
+the router, ResearcherReAct, the rate limiter, Workspace.dump and
+SkillLoader.run_script, a run's timeline nests as:
+
+    pipeline → stage → react.iteration → lm / tool / subprocess / io
+"""
+
+from contextlib import contextmanager
+
+import dspy
+from dspy.utils.callback import BaseCallback
+
+from dspy_langgraph_crewai_comparison.common.tracing import (
+    Tracer,
+    current_tracer,
+    use_tracer,
+)
+from dspy_langgraph_crewai_comparison.dspy_impl.researcher import mark_iteration
+
+MAX_ARG_CHARS = 200
+
+
+class TracingCallback(BaseCallback):
+    def __init__(self):
+        self._open: dict[str, tuple[Tracer, str, str, float, dict]] = {}
+
+    def _start(self, call_id: str, name: str, cat: str, attrs: dict):
+        if tracer := current_tracer():
+            self._open[call_id] = (tracer, name, cat, tracer.now_us(), attrs)
+
+    def _end(self, call_id: str, exception: BaseException | None, **attrs):
+        entry = self._open.pop(call_id, None)
+        if entry is None:
+            return
+        tracer, name, cat, start, args = entry
+        args.update(attrs)
+        if exception is not None:
+            args["error"] = f"{type(exception).__name__}: {exception}"
+        tracer.complete(name, cat, start, args)
+
+    def on_lm_start(self, call_id, instance, inputs):
+        self._start(call_id, f"lm {instance.model}", "lm", {"model": instance.model})
+
+    def on_lm_end(self, call_id, outputs, exception=None):
+        self._end(call_id, exception, completions=len(outputs) if outputs else 0)
+
+    def on_tool_start(self, call_id, instance, inputs):
+        self._start(
+            call_id,
+            f"tool {instance.name}",
+            "tool",
+            {"tool": instance.name, "args": str(inputs.get("kwargs"))[:MAX_ARG_CHARS]},
+        )
+
+    def on_tool_end(self, call_id, outputs, exception=None):
+        self._end(call_id, exception, output_chars=len(str(outputs or "")))
+
+    def on_module_start(self, call_id, instance, inputs):
+        mark_iteration(instance)
+
+
+_callback = TracingCallback()
+
+
+@contextmanager
+def trace_scope(tracer: Tracer):
+    """Record everything run inside the block (and in worker threads that
+    copy its context) into `tracer`."""
+    callbacks = dspy.settings.callbacks
+    if not any(isinstance(cb, TracingCallback) for cb in callbacks):
+        callbacks = [*callbacks, _callback]
+    with use_tracer(tracer), dspy.context(callbacks=callbacks):
+        yield tracer
@@ -0,0 +1,67 @@
+"""Local stub MCP server (stdio) for tests, benchmarks and manual checks.
+
+Tools:
+    search(query)     → the mock web_search (or MOCK_CORPUS_DIR corpus)
+    run_python(code)  → exec in a persistent namespace, returns stdout
+    crash()           → exits the process, to exercise session restarts
+
+stub_config() is the MCPServerConfig that runs it, as used by
+test_mcp_client.py and benchmarks/bench_mcp_pool.py. Or by hand:
+    MCP_SEARCH_COMMAND="env PYTHONPATH=src python tests/mcp_stub_server.py"
+"""
+
+import contextlib
+import io
+import os
+import sys
+from pathlib import Path
+
+try:
+    from mcp.server.mcpserver import MCPServer
+except ImportError:  # mcp < 2
+    from mcp.server.fastmcp import FastMCP as MCPServer
+
+from dspy_langgraph_crewai_comparison.common.mcp_client import MCPServerConfig
+from dspy_langgraph_crewai_comparison.common.tools import web_search
+
+SRC = Path(__file__).parent.parent / "src"
+
+server = MCPServer("stub")
+_namespace: dict = {}
+
+
+@server.tool()
+def search(query: str) -> str:
+    """Search the web for company information."""
+    return web_search(query)
+
+
+@server.tool()
+def run_python(code: str) -> str:
+    """Execute Python code and return what it printed."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        exec(code, _namespace)
+    return out.getvalue()
+
+
+@server.tool()
+def crash() -> str:
+    """Exit immediately, dropping the session."""
+    os._exit(1)
+
+
+def stub_config(name: str = "stub", pool_size: int = 2) -> MCPServerConfig:
+    return MCPServerConfig(
+        name=name,
+        command=sys.executable,
+        args=[str(Path(__file__).resolve())],
+        tool="search",
+        # stdio servers get a minimal environment by default
+        env={"PYTHONPATH": str(SRC.resolve())},
+        pool_size=pool_size,
+    )
+
+
+if __name__ == "__main__":
+    server.run()
@@ -0,0 +1,59 @@
+"""Synthetic corpus and mock web_search tier detection."""
+
+import pytest
+
+from dspy_langgraph_crewai_comparison.common import tools
+from dspy_langgraph_crewai_comparison.common.corpus import (
+    SyntheticCorpus,
+    _strategy_for,
+    generate_corpus,
+    load_search_keywords,
+    load_sector_taxonomy,
+)
+from dspy_langgraph_crewai_comparison.common.tools import MOCK_DATA, _query_tier
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    corpus = tools.use_corpus(generate_corpus(tmp_path, 50, seed=1))
+    yield corpus
+    tools.use_corpus(None)
+
+
+def test_empty_corpus(tmp_path):
+    corpus = SyntheticCorpus(generate_corpus(tmp_path, 0))
+    assert len(corpus) == 0
+    assert corpus.find("anything at all") is None
+    corpus.close()
+
+
+def test_find_ignores_possessives_and_punctuation(corpus):
+    name = next(iter(corpus.index))
+    found, record = corpus.find(f"{name}'s quarterly earnings, please")
+    assert found == name
+    assert _query_tier(f"{name}'s quarterly earnings", record) == "targeted"
+
+
+def test_every_sector_has_its_own_keywords():
+    strategies = load_search_keywords()
+    for sector in load_sector_taxonomy():
+        assert _strategy_for(sector["name"], strategies) != strategies["General"]
+
+
+@pytest.mark.parametrize(
+    ("query", "tier"),
+    [
+        ("apple", "vague"),
+        ("apple quarterly earnings", "targeted"),
+        ("apple revenues", "targeted"),
+        ("apple ai strategy", "sector"),
+    ],
+)
+def test_query_tier(query, tier):
+    assert _query_tier(query, MOCK_DATA["apple"]) == tier
+
+
+def test_keywords_match_whole_words_only():
+    record = {"keywords_sector": ["EDA", "Memory"], "keywords_targeted": []}
+    assert _query_tier("acme comedian memorycard", record) == "vague"
+    assert _query_tier("acme eda tools", record) == "sector"
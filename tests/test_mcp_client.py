@@ -0,0 +1,137 @@
+"""MCPClientPool against the local stub server (mcp_stub_server.py)."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("mcp")
+
+try:  # noqa: E402
+    from mcp.shared.exceptions import MCPError
+except ImportError:  # mcp < 2
+    from mcp.shared.exceptions import McpError as MCPError
+from mcp_stub_server import stub_config  # noqa: E402
+
+from dspy_langgraph_crewai_comparison.common.mcp_client import (  # noqa: E402
+    CONNECTION_CLOSED,
+    MCPClientPool,
+)
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(pool_size: int = 2, **kwargs) -> MCPClientPool:
+        pool = MCPClientPool([stub_config(pool_size=pool_size)], **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_session_reused_across_calls(make_pool):
+    pool = make_pool(pool_size=2)
+    for _ in range(5):
+        assert "Apple" in pool.call_tool("stub", {"query": "Apple"})
+
+    stats = pool.stats()["stub"]
+    assert stats["opened"] == 1
+    assert stats["calls"] == 5
+
+
+def test_concurrent_calls_stay_within_pool_size(make_pool):
+    pool = make_pool(pool_size=2)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: pool.call_tool("stub", {"query": "Tesla"}), range(32)
+            )
+        )
+
+    assert all("Tesla" in result for result in results)
+    stats = pool.stats()["stub"]
+    assert stats["opened"] <= 2
+    assert stats["sessions"] <= 2
+    assert stats["calls"] == 32
+
+
+def test_restart_after_server_crash(make_pool):
+    pool = make_pool(pool_size=1)
+    pool.call_tool("stub", {"query": "Apple"})
+
+    with pytest.raises(MCPError) as crashed:
+        pool.call_tool("stub", {}, tool="crash")
+    assert crashed.value.error.code == CONNECTION_CLOSED
+
+    assert "Nvidia" in pool.call_tool("stub", {"query": "Nvidia"})
+    stats = pool.stats()["stub"]
+    assert stats["restarts"] >= 1
+    assert stats["sessions"] == 1
+
+
+def test_tool_error_keeps_session(make_pool):
+    pool = make_pool(pool_size=1)
+    result = pool.call_tool("stub", {"code": "1 / 0"}, tool="run_python")
+    assert result.startswith("Tool error")
+
+    assert "Apple" in pool.call_tool("stub", {"query": "Apple"})
+    stats = pool.stats()["stub"]
+    assert stats["opened"] == 1
+    assert stats["restarts"] == 0
+
+
+def test_call_timeout_keeps_session(make_pool):
+    pool = make_pool(pool_size=1, call_timeout=0.5)
+    with pytest.raises(TimeoutError):
+        pool.call_tool(
+            "stub", {"code": "import time; time.sleep(2)"}, tool="run_python"
+        )
+
+    assert "Apple" in pool.call_tool("stub", {"query": "Apple"})
+    stats = pool.stats()["stub"]
+    assert stats["opened"] == 1
+    assert stats["restarts"] == 0
+
+
+def test_warm_up_fills_pool(make_pool):
+    pool = make_pool(pool_size=3)
+    pool.call_tool("stub", {"query": "Apple"})
+    pool.warm_up()
+    pool.warm_up()
+
+    stats = pool.stats()["stub"]
+    assert stats["opened"] == 3
+    assert stats["sessions"] == 3
+
+
+def _run_python(pool: MCPClientPool, code: str) -> str:
+    return pool.call_tool("stub", {"code": code}, tool="run_python")
+
+
+def test_run_session_keeps_state_within_a_run_only(make_pool):
+    pool = make_pool(pool_size=1)
+    with pool.run_session("stub"):
+        _run_python(pool, "x = 42")
+        assert _run_python(pool, "print(x)").strip() == "42"
+
+    with pool.run_session("stub"):
+        assert _run_python(pool, "print(x)").startswith("Tool error")
+
+    stats = pool.stats()["stub"]
+    assert stats["opened"] == 2
+    assert stats["sessions"] == 0
+
+
+def test_concurrent_run_sessions_are_isolated(make_pool):
+    pool = make_pool(pool_size=2)
+
+    def run(value: int) -> str:
+        with pool.run_session("stub"):
+            _run_python(pool, f"x = {value}")
+            return _run_python(pool, "import time; time.sleep(0.2); print(x)")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert [r.strip() for r in executor.map(run, [1, 2])] == ["1", "2"]
@@ -0,0 +1,53 @@
+"""GEPA devset construction."""
+
+import dspy
+import pytest
+
+from dspy_langgraph_crewai_comparison.common import tools
+from dspy_langgraph_crewai_comparison.common.corpus import generate_corpus
+from dspy_langgraph_crewai_comparison.common.tools import MOCK_DATA
+from dspy_langgraph_crewai_comparison.dspy_impl.optimize import (
+    build_devset,
+    configure_memory_from_args,
+    parse_args,
+    split_devset,
+)
+
+
+def test_mock_devset_splits_disjoint():
+    trainset, valset = split_devset(build_devset())
+    train = {example.company_name for example in trainset}
+    val = {example.company_name for example in valset}
+    assert train and val
+    assert not train & val
+    assert len(train | val) == len(MOCK_DATA)
+
+
+def test_split_needs_two_companies():
+    with pytest.raises(ValueError):
+        split_devset(build_devset()[:1])
+
+
+def test_corpus_sample_clamped_to_corpus_size(tmp_path):
+    try:
+        devset = build_devset(str(generate_corpus(tmp_path, 3, seed=1)), size=10)
+    finally:
+        tools.use_corpus(None)
+    assert len(devset) == len(MOCK_DATA) + 3
+
+
+@pytest.fixture
+def restore_settings():
+    saved = {
+        key: dspy.settings.get(key)
+        for key in ("disable_history", "max_history_size", "max_trace_size")
+    }
+    yield
+    dspy.configure(**saved)
+
+
+def test_history_size_zero_keeps_optimizer_trace(restore_settings):
+    default = dspy.settings.max_trace_size
+    configure_memory_from_args(parse_args(["--history-size", "0"]), bound_trace=False)
+    assert dspy.settings.disable_history
+    assert dspy.settings.max_trace_size == default
@@ -0,0 +1,133 @@
+"""Incremental refresh: snapshot fingerprints, diffs and the path decision."""
+
+import pytest
+
+from dspy_langgraph_crewai_comparison.common.models import CompanyFacts
+from dspy_langgraph_crewai_comparison.dspy_impl import refresh
+from dspy_langgraph_crewai_comparison.dspy_impl.pipeline import (
+    CompanyResearchPipeline,
+)
+from dspy_langgraph_crewai_comparison.dspy_impl.refresh import (
+    IncrementalRefresher,
+    RefreshStore,
+    classify,
+    diff_snapshots,
+    fingerprint,
+    merge_delta,
+)
+
+SNAPSHOT = {
+    "news": ["Launch A", "Deal B", "Hire C"],
+    "financials": ["Revenue $10B", "EPS $1.20"],
+    "events": ["Q3 earnings call"],
+    "sources": ["https://example.com/a"],
+}
+FACTS = CompanyFacts(
+    company_name="Acme",
+    sector="Technology",
+    recent_news=SNAPSHOT["news"],
+    financial_highlights=SNAPSHOT["financials"],
+    key_events=SNAPSHOT["events"],
+    sources=SNAPSHOT["sources"],
+)
+
+
+def _with(section: str, items: list[str]) -> dict[str, list[str]]:
+    return {**SNAPSHOT, section: items}
+
+
+def _state(snapshot: dict) -> dict:
+    return {"fingerprint": fingerprint(snapshot), "snapshot": snapshot}
+
+
+def test_fingerprint_ignores_item_order():
+    reordered = _with("news", list(reversed(SNAPSHOT["news"])))
+    assert fingerprint(reordered) == fingerprint(SNAPSHOT)
+    assert fingerprint(_with("news", ["Launch A"])) != fingerprint(SNAPSHOT)
+
+
+def test_diff_snapshots():
+    new = {**_with("news", ["Recall D", "Launch A", "Deal B"]), "insights": ["X"]}
+    added, removed = diff_snapshots(SNAPSHOT, new)
+    assert added == {"news": ["Recall D"], "insights": ["X"]}
+    assert removed == {"news": ["Hire C"]}
+
+
+@pytest.mark.parametrize(
+    ("previous", "snapshot", "path"),
+    [
+        (None, SNAPSHOT, "full"),
+        (_state(SNAPSHOT), SNAPSHOT, "unchanged"),
+        (
+            _state(SNAPSHOT),
+            _with("news", ["Recall D", *SNAPSHOT["news"]]),
+            "writer_only",
+        ),
+        (_state(SNAPSHOT), _with("sources", []), "writer_only"),
+        (_state(SNAPSHOT), _with("financials", ["Revenue $11B"]), "full"),
+        (_state(SNAPSHOT), _with("events", []), "full"),
+    ],
+)
+def test_classify(previous, snapshot, path):
+    assert classify(previous, snapshot)[0] == path
+
+
+def test_merge_delta_puts_new_news_first():
+    facts = merge_delta(
+        FACTS,
+        added={"news": ["Recall D"], "sources": ["https://example.com/b"]},
+        removed={"news": ["Hire C"], "sources": ["https://example.com/a"]},
+    )
+    assert facts.recent_news == ["Recall D", "Launch A", "Deal B"]
+    assert facts.sources == ["https://example.com/b"]
+    assert FACTS.sources == ["https://example.com/a"]
+
+
+@pytest.fixture
+def refresher(tmp_path, monkeypatch):
+    refresher = IncrementalRefresher(
+        CompanyResearchPipeline(), RefreshStore(str(tmp_path))
+    )
+    monkeypatch.setattr(
+        refresher,
+        "_research",
+        lambda company: {"company_facts": FACTS.model_dump(), "review_stale": False},
+    )
+    monkeypatch.setattr(refresher, "_update_summary", lambda *args: {"delta": True})
+    return refresher
+
+
+def _refresh(refresher, monkeypatch, snapshot: dict) -> dict:
+    monkeypatch.setattr(refresh, "search_snapshot", lambda company: snapshot)
+    return refresher.refresh("Acme")
+
+
+@pytest.mark.parametrize(
+    ("snapshot", "path"),
+    [
+        (
+            _with("sources", [*SNAPSHOT["sources"], "https://example.com/b"]),
+            "writer_only",
+        ),
+        (_with("sources", [*SNAPSHOT["sources"], "not a url"]), "full"),
+        (_with("news", ["Launch A"]), "full"),
+    ],
+)
+def test_delta_failing_checks_runs_full(refresher, monkeypatch, snapshot, path):
+    _refresh(refresher, monkeypatch, SNAPSHOT)
+    assert _refresh(refresher, monkeypatch, snapshot)["path"] == path
+    assert refresher.report() == {
+        "unchanged": 0,
+        "writer_only": int(path == "writer_only"),
+        "full": 1 + int(path == "full"),
+    }
+
+
+def test_not_counted_when_save_fails(refresher, monkeypatch):
+    def fail(company, state):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(refresher.store, "save", fail)
+    with pytest.raises(OSError):
+        _refresh(refresher, monkeypatch, SNAPSHOT)
+    assert sum(refresher.report().values()) == 0
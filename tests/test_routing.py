@@ -0,0 +1,59 @@
+"""StageRouter latency baselines and the cascade's latency_saved_s."""
+
+import dspy
+
+from dspy_langgraph_crewai_comparison.dspy_impl.routing import (
+    LatencyBaselines,
+    StageRoute,
+    StageRouter,
+)
+
+
+def _cascade_router(baselines: LatencyBaselines) -> StageRouter:
+    fast = dspy.utils.DummyLM([{"answer": "fast"}] * 10)
+    strong = dspy.utils.DummyLM([{"answer": "strong"}] * 10)
+    return StageRouter({"writer": StageRoute(fast, strong)}, baselines)
+
+
+def test_baselines_persist_across_instances(tmp_path):
+    path = tmp_path / "baselines.json"
+    LatencyBaselines(path).record("writer", 4.0)
+    assert LatencyBaselines(path).mean("writer") == 4.0
+
+
+def test_default_baseline_until_measured():
+    baselines = LatencyBaselines(defaults={"writer": 3.0})
+    assert baselines.mean("writer") == 3.0
+    baselines.record("writer", 5.0)
+    assert baselines.mean("writer") == 5.0
+    assert baselines.mean("reviewer") is None
+
+
+def test_run_without_escalation_reports_saving():
+    router = _cascade_router(LatencyBaselines(defaults={"writer": 10.0}))
+    router.start_run()
+    router.call("writer", dspy.Predict("question -> answer"), question="q")
+
+    summary = router.run_summary()
+    assert summary["escalations"] == 0
+    assert 9.0 < summary["latency_saved_s"] <= 10.0
+
+
+def test_no_baseline_reports_none():
+    router = _cascade_router(LatencyBaselines())
+    router.start_run()
+    router.call("writer", dspy.Predict("question -> answer"), question="q")
+    assert router.run_summary()["latency_saved_s"] is None
+
+
+def test_call_strong_is_not_an_escalation():
+    baselines = LatencyBaselines()
+    router = _cascade_router(baselines)
+    router.start_run()
+    result = router.call_strong(
+        "writer", dspy.Predict("question -> answer"), question="q"
+    )
+
+    assert result.answer == "strong"
+    assert router.run_summary()["escalations"] == 0
+    assert baselines.mean("writer") is not None
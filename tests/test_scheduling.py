@@ -0,0 +1,107 @@
+"""Rate limiting of dspy LM calls and the researcher's run budget."""
+
+import uuid
+
+import dspy
+from dspy.utils import DummyLM
+
+from dspy_langgraph_crewai_comparison.common.scheduler import (
+    RateLimit,
+    RateLimitScheduler,
+    RunBudget,
+    run_scope,
+)
+from dspy_langgraph_crewai_comparison.common.tracing import Tracer
+from dspy_langgraph_crewai_comparison.dspy_impl.researcher import ResearcherReAct
+from dspy_langgraph_crewai_comparison.dspy_impl.scheduling import RateLimitCallback
+from dspy_langgraph_crewai_comparison.dspy_impl.tracing import trace_scope
+
+
+class CachingDummyLM(DummyLM):
+    """DummyLM answers through dspy's response cache, like a real LM."""
+
+    def __init__(self, answers):
+        super().__init__(answers)
+        self._cache_responses = True
+
+
+def _scheduled_calls(lm: DummyLM, prompts: list[str]):
+    scheduler = RateLimitScheduler(default=RateLimit(rpm=60, tpm=10_000))
+    budgets = []
+    with dspy.context(callbacks=[RateLimitCallback(scheduler)]):
+        for prompt in prompts:
+            with run_scope(RunBudget()) as budget:
+                lm(prompt)
+            budgets.append(budget)
+    requests, _ = scheduler._buckets["*"]
+    return budgets, requests
+
+
+def test_cache_hit_is_refunded():
+    prompt = f"cache test {uuid.uuid4()}"
+    lm = CachingDummyLM([{"answer": "a"}] * 2)
+    (miss, hit), requests = _scheduled_calls(lm, [prompt, prompt])
+
+    assert miss.lm_calls == 1 and miss.tokens > 0
+    assert hit.lm_calls == 0 and hit.tokens == 0
+    assert round(requests.level) == 59
+
+
+def test_uncached_calls_are_charged():
+    prompt = f"cache test {uuid.uuid4()}"
+    lm = DummyLM([{"answer": "a"}] * 2)
+    budgets, requests = _scheduled_calls(lm, [prompt, prompt])
+
+    assert [budget.lm_calls for budget in budgets] == [1, 1]
+    assert round(requests.level) == 58
+
+
+def test_usage_still_reaches_outer_tracker():
+    lm = DummyLM([{"answer": "a"}])
+    with dspy.track_usage() as usage:
+        _scheduled_calls(lm, [f"usage test {uuid.uuid4()}"])
+    assert usage.usage_data["dummy"]
+
+
+def _researcher(calls: list[str]) -> ResearcherReAct:
+    def search(query: str) -> str:
+        """Search the web."""
+        calls.append(query)
+        return f"Results for {query}"
+
+    return ResearcherReAct("company_name -> facts", tools=[search], max_iters=3)
+
+
+STEPS = [
+    {
+        "next_thought": "Search",
+        "next_tool_name": "search",
+        "next_tool_args": {"query": "Acme"},
+    },
+    {"next_thought": "Done", "next_tool_name": "finish", "next_tool_args": {}},
+    {"reasoning": "Extract", "facts": "Acme makes anvils"},
+]
+
+
+def test_tools_refuse_once_budget_spent():
+    calls = []
+    with dspy.context(lm=DummyLM(STEPS)), run_scope(RunBudget(max_seconds=0)):
+        result = _researcher(calls)(company_name="Acme")
+
+    assert calls == []
+    assert result.trajectory["observation_0"].startswith("Not run: time budget spent")
+    assert result.facts == "Acme makes anvils"
+
+
+def test_iteration_spans():
+    calls, tracer = [], Tracer()
+    with dspy.context(lm=DummyLM(STEPS)), trace_scope(tracer):
+        _researcher(calls)(company_name="Acme")
+
+    iterations = [
+        event["args"]["iteration"]
+        for event in tracer.to_json()["traceEvents"]
+        if event["name"] == "react.iteration"
+    ]
+    assert calls == ["Acme"]
+    assert iterations == [0, 1]